@@ -1,19 +1,35 @@
 import time
 import os
-import random
 import sys
 import ctypes
 import json
 import keyboard 
+import asyncio
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
 # --- 1. COLOR & LOGGING ENGINE ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BASE_DIR)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from asset_tools import ambientcg
+from asset_tools.browser import resolve_driver, start_chrome
+from asset_tools.catalog import AssetCatalog, AMBIENTCG
+from asset_tools.completion import CompletionTracker
+from asset_tools.http_client import make_session, download_resumable
+from asset_tools.extraction import describe
+from asset_tools.journal_queue import JournalQueue
+from asset_tools.pipeline import ExtractionPipeline
+from asset_tools.rate_limit import AdaptiveRateLimiter
+from asset_tools.scheduler import DownloadScheduler, GB
+from asset_tools.selection import DEFAULT_RULES, compile_rules, plan_assets, select_links
+from asset_tools.telemetry import Telemetry
+
 DEBUG_FILE = os.path.join(BASE_DIR, "scraper_debug.log")
 
 class Color:
@@ -24,10 +40,19 @@ class Color:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+_debug_log = None
+_debug_flushed = 0.0
+
 def trace(msg):
+    global _debug_log, _debug_flushed
     t = datetime.now().strftime("%H:%M:%S")
-    with open(DEBUG_FILE, "a") as f:
-        f.write(f"[{t}] {msg}\n")
+    if _debug_log is None:
+        _debug_log = open(DEBUG_FILE, "a", buffering=65536)  # Kept open; flushed at most once per second
+        atexit.register(_debug_log.close)
+    _debug_log.write(f"[{t}] {msg}\n")
+    if time.monotonic() - _debug_flushed >= 1.0:
+        _debug_log.flush()
+        _debug_flushed = time.monotonic()
     print(f"{Color.CYAN}[{t}] [DEBUG]{Color.END} {msg}")
 
 def status_log(asset_id, info=""):
@@ -49,8 +74,9 @@ def log_failure(download_dir, asset_id, file_name, reason):
     with open(md_file, "a") as f:
         f.write(f"| {timestamp} | **{asset_id}** | {file_name} | {reason} |\n")
 
-with open(DEBUG_FILE, "w") as f:
-    f.write(f"--- FULL AUTONOMOUS SESSION START: {datetime.now()} ---\n")
+if __name__ == "__main__":  # Extraction worker processes re-import this file; only the real session resets the log
+    with open(DEBUG_FILE, "w") as f:
+        f.write(f"--- FULL AUTONOMOUS SESSION START: {datetime.now()} ---\n")
 
 def ensure_popup_and_admin():
     if not ctypes.windll.shell32.IsUserAnAdmin():
@@ -62,29 +88,231 @@ def ensure_popup_and_admin():
 # --- 2. GLOBAL CONFIG ---
 STOP_HOTKEY = 'ctrl+alt+shift+end' 
 CONCURRENT_LIMIT = 8 
-STAGGER_DELAY = (1.5, 3.5) 
+PER_HOST_LIMIT = 6
+MAX_BYTES_IN_FLIGHT = 4 * GB
+# Page loads, link lookups and download clicks are paced by an adaptive rate controller (asset_tools/rate_limit.py):
+# the rate (requests/s) climbs while the site answers quickly, halves on 429/503s, timeouts or slow pages, and
+# waits out any Retry-After. REQUEST_JITTER is random extra spacing kept on every request, however fast it gets.
+REQUEST_RATE, REQUEST_MIN_RATE, REQUEST_MAX_RATE = 0.5, 0.05, 2.0
+REQUEST_JITTER = (0.3, 1.5)
+LARGE_FILE_SEGMENTS = 1  # >1 splits HTTP-mode files of 256 MB+ into parallel byte ranges (extra connections per host)
+DOWNLOAD_TIMEOUT = 3600  # Seconds a browser download may stay unfinished before it is logged as failed
 stop_requested = False
-stats = {"success": 0, "failed": 0}
+stats = {"success": 0, "failed": 0, "extracted": 0}
+pipeline = None  # ExtractionPipeline when archives are extracted while downloading
+# Phase timings go to ../telemetry/ambientcg.events.jsonl and a Prometheus textfile (see asset_tools/telemetry.py).
+telemetry = None  # Created in run_scraper so extraction worker processes never write metrics
+pacing = None     # AdaptiveRateLimiter shared by every request to the site, created in run_scraper
+# Which download buttons to take; override with "selection_rules" in scraper_config_full.json.
+# See asset_tools/selection.py for the syntax, e.g. ["all * not:JPG"] for every non-JPG file.
+rules = compile_rules(DEFAULT_RULES)
+PLAN_WORKERS = 4               # View pages fetched in parallel by the dry-run planner
+PLAN_RATE, PLAN_MAX_RATE = 2.0, 6.0  # Dry-run page requests/s (adaptive, like REQUEST_RATE)
+PLAN_THROUGHPUT = 20 * 1048576 # Assumed download speed (bytes/s) for the dry-run time estimate
 
 def trigger_stop():
     global stop_requested
     trace("!!! EMERGENCY STOP DETECTED !!!")
     stop_requested = True
 
-def get_active_downloads(download_path):
-    files = [f for f in os.listdir(download_path) if f.endswith('.crdownload')]
-    trace(f"Capacity Check: {len(files)}/{CONCURRENT_LIMIT} slots active.")
-    return len(files)
+def hand_off(path):
+    """Passes a finished archive to the extraction pipeline (blocks while the pipeline is full)."""
+    if pipeline is not None:
+        pipeline.submit(path)
+
+def fail_asset(asset_id, catalog, queue):
+    """Marks an asset failed; the catalog keeps it so the next run puts it back on the queue."""
+    catalog.mark(AMBIENTCG, asset_id, "failed")
+    queue.failed(asset_id)
+    stats["failed"] += 1
+    telemetry.event("asset_failed", asset=asset_id)
+
+def report_extraction(result, catalog):
+    name = os.path.basename(result["path"])
+    telemetry.observe(result["stage"], result.get("seconds") or 0.0, result.get("bytes") if result["ok"] else None,
+                      archive=name, ok=result["ok"])
+    if result["stage"] == "extract":
+        catalog.record_extraction(result)
+    if result["ok"]:
+        trace(f"Extracted {name}: {describe(result)}")
+        catalog.set_file_status(result["path"], "extracted")
+        stats["extracted"] += 1
+    else:
+        trace(f"{result['stage'].title()} failed for {name}: {result['error']}")
+        catalog.set_file_status(result["path"], "corrupt" if result["stage"] == "verify" else "extract_failed")
+
+def settle_assets(asset_futures, download_dir, catalog, queue):
+    """Records every asset whose browser downloads have all resolved; keeps the rest pending."""
+    for asset_id in [a for a, futs in asset_futures.items() if all(f.done() for f in futs)]:
+        futures = asset_futures.pop(asset_id)
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        for err in errors:
+            trace(f"Download for {asset_id} did not finish: {err}")
+            log_failure(download_dir, asset_id, "TRANSFER", str(err))
+        for f in futures:
+            if f.exception() is None:
+                result = f.result()
+                trace(f"Finished {os.path.basename(result.path)} ({result.size / 1048576:.1f} MB in {result.duration:.0f}s)")
+                telemetry.observe("transfer", result.duration, result.size, asset=asset_id, mode="browser")
+                catalog.add_file(AMBIENTCG, asset_id, result.path, result.size)
+                hand_off(result.path)
+        if errors:
+            fail_asset(asset_id, catalog, queue)
+            continue
+        catalog.mark(AMBIENTCG, asset_id)
+        queue.done(asset_id)
+        stats["success"] += 1
+        telemetry.event("asset_downloaded", asset=asset_id)
 
 CONFIG_FILE = os.path.join(BASE_DIR, "scraper_config_full.json")
 QUEUE_FILE = os.path.join(BASE_DIR, "pending_assets.json")
+INDEX_CURSOR_FILE = os.path.join(BASE_DIR, "index_cursor.json")
 
 def load_json(p): return json.load(open(p, "r")) if os.path.exists(p) else {}
 def save_json(p, d): json.dump(d, open(p, "w"))
 
-# --- 3. ENGINE ---
+def run_dry_run(queue, base_url):
+    """Reports what the selection rules would download for the whole queue, without downloading."""
+    session = make_session(pool_size=PLAN_WORKERS)
+    asset_ids = sorted(queue.ids())
+    trace(f"Planning {len(asset_ids)} queued assets with rules: {', '.join(r.text for r in rules)}")
+    report = plan_assets(lambda asset_id: ambientcg.fetch_download_links(session, asset_id, base_url),
+                         asset_ids, rules, workers=PLAN_WORKERS,
+                         limiter=AdaptiveRateLimiter(PLAN_RATE, max_rate=PLAN_MAX_RATE, concurrency=PLAN_WORKERS,
+                                                     jitter=(0.0, 1.0 / PLAN_RATE), on_change=trace),
+                         should_stop=lambda: stop_requested)
+    per_asset = 1.0 / REQUEST_RATE + sum(REQUEST_JITTER) / 2
+    seconds = report["bytes"] / PLAN_THROUGHPUT + report["planned_assets"] * per_asset / CONCURRENT_LIMIT
+    print("\n" + "=" * 30)
+    print(f"Assets planned:   {report['planned_assets']} of {report['assets']} ({len(report['failed'])} could not be read)")
+    print(f"Files:            {report['files']} of {report['offered_files']} offered")
+    print(f"Download size:    {report['bytes'] / 1073741824:.2f} GB of {report['offered_bytes'] / 1073741824:.2f} GB offered"
+          + (f" ({report['unknown_size']} file(s) without a size label)" if report["unknown_size"] else ""))
+    for fmt, (files, size) in sorted(report["by_format"].items()):
+        print(f"  {fmt:<6} {files:>6} file(s) {size / 1073741824:>9.2f} GB")
+    print(f"Estimated time:   {seconds / 3600:.1f} h at {PLAN_THROUGHPUT / 1048576:.0f} MB/s")
+    print("=" * 30)
+
+# --- 3. INCREMENTAL INDEX ---
+def run_incremental_index(queue, processed, base_url):
+    """Pages the newest-first listing API and enqueues unseen ids, saving the cursor after each page."""
+    session = make_session(pool_size=1)
+    cursor = ambientcg.load_cursor(INDEX_CURSOR_FILE)
+    if cursor.get("complete"):
+        trace("Checking for assets newer than the last index...")
+    else:
+        trace(f"Indexing full list (resuming at offset {cursor.get('backfill_offset', 0)})...")
+    added = 0
+    with telemetry.span("index") as span:
+        for fresh, cursor in ambientcg.iter_new_assets(session, processed | queue.ids(), cursor, base_url=base_url,
+                                                       should_stop=lambda: stop_requested):
+            queue.enqueue(fresh)
+            added += len(fresh)
+            ambientcg.save_cursor(INDEX_CURSOR_FILE, cursor)
+        span["new_assets"] = added
+    trace(f"Indexing Complete. {added} new assets added to queue ({len(queue)} pending).")
+
+# --- 4. DIRECT HTTP ENGINE (NO BROWSER) ---
+async def download_asset(scheduler, session, asset_id, wanted, download_dir, catalog, queue):
+    """Runs every wanted file of one asset through the scheduler and records the asset once all are on disk."""
+    def transfer(url, queued_at):
+        telemetry.observe("queue_wait", time.perf_counter() - queued_at, asset=asset_id)
+        with telemetry.span("transfer", asset=asset_id, mode="http") as span:
+            # Every 429/503 (and its Retry-After) reaches the shared limiter as it happens, pausing link lookups too
+            try:
+                path, size = download_resumable(session, url, download_dir, segments=LARGE_FILE_SEGMENTS,
+                                                on_throttle=lambda err: pacing.record(error=err))
+            except Exception as e:
+                if getattr(e, "response", None) is None:
+                    pacing.record(error=e)  # Timeouts and dropped connections after the last retry
+                raise
+            span["bytes"] = size
+        return path, size
+
+    jobs = [scheduler.run(url, ambientcg.parse_size_label(label), transfer, url, time.perf_counter())
+            for label, url in wanted]
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    failed = False
+    for (label, _), result in zip(wanted, results):
+        if isinstance(result, Exception):
+            trace(f"Failed to download {label}: {result}")
+            log_failure(download_dir, asset_id, label, str(result))
+            failed = True
+        else:
+            path, size = result
+            trace(f"Saved {os.path.basename(path)} ({size / 1048576:.1f} MB) | {scheduler.describe()}")
+            catalog.add_file(AMBIENTCG, asset_id, path, size)
+            await asyncio.get_running_loop().run_in_executor(None, hand_off, path)
+    if failed:
+        fail_asset(asset_id, catalog, queue)
+    else:
+        catalog.mark(AMBIENTCG, asset_id)
+        queue.done(asset_id)
+        stats["success"] += 1
+        telemetry.event("asset_downloaded", asset=asset_id)
+
+def paced_links(session, asset_id, base_url):
+    """Fetches an asset's download links inside the shared rate controller (on an executor thread)."""
+    with pacing.request():
+        return ambientcg.fetch_download_links(session, asset_id, base_url)
+
+async def http_engine(queue, download_dir, catalog, base_url):
+    loop = asyncio.get_running_loop()
+    session = make_session(pool_size=2)
+    # Transfers see 429/503 themselves (instead of urllib3 retrying quietly) to report them to `pacing`
+    transfer_session = make_session(pool_size=CONCURRENT_LIMIT + 1, respect_retry_after=False)
+    executor = ThreadPoolExecutor(max_workers=CONCURRENT_LIMIT + 1)
+    scheduler = DownloadScheduler(max_bytes_in_flight=MAX_BYTES_IN_FLIGHT, max_per_host=PER_HOST_LIMIT,
+                                  max_total=CONCURRENT_LIMIT, executor=executor)
+    asset_tasks = []
+    try:
+        while queue and not stop_requested:
+            await scheduler.wait_for_room()
+            asset_id = queue.claim()
+            status_log(asset_id, "Fetching download links over HTTP...")
+            try:
+                with telemetry.span("link_discovery", asset=asset_id, mode="http") as span:
+                    links = await loop.run_in_executor(executor, paced_links, session, asset_id, base_url)
+                    span["links"] = len(links)
+                if not links:
+                    trace(f"No download links found for {asset_id}.")
+                    log_failure(download_dir, asset_id, "ALL", "No links found on page")
+                    fail_asset(asset_id, catalog, queue)
+                    continue
+
+                wanted = select_links(links, rules)
+                if not wanted:
+                    trace(f"Asset {asset_id} had links but none matched the selection rules.")
+                    catalog.mark(AMBIENTCG, asset_id, "skipped")
+                    telemetry.event("asset_skipped", asset=asset_id)
+                    queue.done(asset_id)
+                    continue
+
+                for label, _ in wanted:
+                    trace(f"Queued: {label}")
+                asset_tasks.append(asyncio.create_task(
+                    download_asset(scheduler, transfer_session, asset_id, wanted, download_dir, catalog, queue)))
+            except Exception as e:
+                trace(f"CRITICAL ERROR on {asset_id}: {str(e)}")
+                log_failure(download_dir, asset_id, "CRITICAL", str(e))
+                fail_asset(asset_id, catalog, queue)
+
+        if asset_tasks:
+            trace("Waiting for final file transfers to finalize...")
+            await asyncio.gather(*asset_tasks)
+    finally:
+        executor.shutdown(wait=False)
+
+def run_http_engine(queue, download_dir, catalog, base_url):
+    """Parses view pages over HTTP and streams every wanted `get?file=` link straight to disk."""
+    asyncio.run(http_engine(queue, download_dir, catalog, base_url))
+
+# --- 5. ENGINE ---
 def run_scraper():
-    global stop_requested
+    global stop_requested, pipeline, rules, telemetry, pacing
+    telemetry = Telemetry("ambientcg")
+    pacing = AdaptiveRateLimiter(REQUEST_RATE, min_rate=REQUEST_MIN_RATE, max_rate=REQUEST_MAX_RATE,
+                                 jitter=REQUEST_JITTER, on_change=trace)
     keyboard.add_hotkey(STOP_HOTKEY, trigger_stop)
 
     try:
@@ -94,6 +322,44 @@ def run_scraper():
             download_dir = input("Enter download path: ").strip().replace('"', '')
             save_json(CONFIG_FILE, {"download_path": download_dir})
 
+        base_url = config.get("base_url", ambientcg.BASE_URL)
+        http_mode = input("Use direct HTTP downloads (no browser)? (y/n): ").lower() in ['y', 'yes']
+        extract_live = input("Extract archives as they finish downloading? (y/n): ").lower() in ['y', 'yes']
+        dry_run = input("Dry run: only plan what would be downloaded? (y/n): ").lower() in ['y', 'yes']
+        rules = compile_rules(config.get("selection_rules", DEFAULT_RULES))
+
+        catalog = AssetCatalog()
+        imported = catalog.import_history_file(AMBIENTCG, os.path.join(download_dir, "download_history.txt"))
+        if imported:
+            trace(f"Imported {imported} ids from download_history.txt into the asset catalog.")
+        processed = catalog.known_ids(AMBIENTCG)
+        if extract_live:
+            pipeline = ExtractionPipeline(os.path.join(download_dir, "Extracted_Materials"),
+                                          on_result=lambda result: report_extraction(result, catalog))
+
+        queue = JournalQueue(QUEUE_FILE)
+        # Failed ids leave the queue, and the incremental index never revisits old ids, so retry them here
+        retry = catalog.failed_ids(AMBIENTCG) - queue.ids()
+        if retry:
+            queue.enqueue(sorted(retry))
+            trace(f"Re-queued {len(retry)} asset(s) that failed on an earlier run.")
+
+        # --- INCREMENTAL INDEXING ---
+        index_error = None
+        try:
+            run_incremental_index(queue, processed, base_url)
+        except Exception as e:
+            index_error = e
+            trace(f"Incremental index failed: {e}")
+
+        if dry_run:
+            run_dry_run(queue, base_url)
+            return
+
+        if http_mode:
+            run_http_engine(queue, download_dir, catalog, base_url)
+            return
+
         load_images = input("Enable image loading? (y/n): ").lower() in ['y', 'yes']
         block_ads = input("Disable ads? (y/n): ").lower() in ['y', 'yes']
 
@@ -105,24 +371,23 @@ def run_scraper():
             "profile.managed_default_content_settings.images": 1 if load_images else 2
         })
         
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        resolve_start = time.perf_counter()
+        driver_path, driver_source = resolve_driver()
+        resolve_seconds = time.perf_counter() - resolve_start
+        driver, launch_seconds = start_chrome(chrome_options, driver_path, profile="ambientcg")
+        trace(f"Chrome ready in {resolve_seconds + launch_seconds:.1f}s "
+              f"(driver from {driver_source}: {resolve_seconds:.2f}s, launch: {launch_seconds:.1f}s)")
         
         if block_ads:
             trace("Applying Network Filters...")
             driver.execute_cdp_cmd('Network.enable', {})
             driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": ["*google-analytics.com*", "*doubleclick.net*", "*carbonads.net*"]})
 
-        history_file = os.path.join(download_dir, "download_history.txt")
-        processed = set()
-        if os.path.exists(history_file):
-            with open(history_file, "r") as f: processed = set(line.strip() for line in f if line.strip())
-
-        # --- DYNAMIC INDEXING ---
-        queue = load_json(QUEUE_FILE).get("pending", [])
-        if not queue:
+        # --- FALLBACK: SCROLL INDEXING (only when the listing API is unreachable) ---
+        if not queue and index_error is not None:
             # UPDATED URL to generic "Popular" list
             trace("Queue empty. Indexing master list (All Types)...")
-            driver.get("https://ambientcg.com/list?sort=popular")
+            driver.get(f"{base_url}/list?sort=popular")
             time.sleep(5)
             
             last_height = driver.execute_script("return document.body.scrollHeight")
@@ -138,74 +403,87 @@ def run_scraper():
 
             blocks = driver.find_elements(By.CLASS_NAME, "asset-block")
             ids = [el.get_attribute("id").replace("asset-", "") for el in blocks if el.get_attribute("id")]
-            queue = [aid for aid in ids if aid not in processed]
-            save_json(QUEUE_FILE, {"pending": queue})
+            queue.enqueue([aid for aid in ids if aid not in processed])
             trace(f"Indexing Complete. {len(queue)} assets added to queue.")
 
         # --- MAIN LOOP ---
+        tracker = CompletionTracker(download_dir)
+        trace(f"Tracking download completion via {tracker.backend}.")
+        asset_futures = {}
         while queue and not stop_requested:
-            active = get_active_downloads(download_dir)
+            settle_assets(asset_futures, download_dir, catalog, queue)
+            active = tracker.pending()
             if active >= CONCURRENT_LIMIT:
-                trace(f"At capacity ({active}). Waiting 4s...")
-                time.sleep(4)
+                trace(f"At capacity ({active}). Waiting for a download to finish...")
+                tracker.wait_any(timeout=30)
+                tracker.expire(DOWNLOAD_TIMEOUT)
                 continue
 
-            asset_id = queue.pop(0)
+            asset_id = queue.claim()
             status_log(asset_id, "Scanning file types...")
             
             try:
-                driver.get(f"https://ambientcg.com/view?id={asset_id}")
-                time.sleep(1.5)
+                with pacing.request(), telemetry.span("page_load", asset=asset_id):
+                    driver.get(ambientcg.view_url(asset_id, base_url))
+                time.sleep(1.5)  # Let the download buttons render
                 
                 # UPDATED SELECTOR: Targets ALL download buttons
-                links = driver.find_elements(By.XPATH, "//a[contains(@href, 'get?file=')]")
+                with telemetry.span("link_discovery", asset=asset_id, mode="browser") as span:
+                    links = driver.find_elements(By.XPATH, "//a[contains(@href, 'get?file=')]")
+                    span["links"] = len(links)
                 
                 if not links:
                     trace(f"No download links found for {asset_id}.")
                     log_failure(download_dir, asset_id, "ALL", "No links found on page")
-                    stats["failed"] += 1
+                    fail_asset(asset_id, catalog, queue)
                     continue
 
-                clicked_count = 0
-                for link in links:
-                    label = link.text.strip().replace('\n', ' ')
-                    
-                    # LOGIC: Exclude JPG, allow everything else
-                    if "JPG" in label.upper():
-                        trace(f"Skipping excluded format: {label}")
-                        continue
-                    
+                clicked = []
+                labelled = [(link.text.strip().replace('\n', ' '), link) for link in links]
+                wanted = select_links(labelled, rules)
+                for label, _ in labelled:
+                    if all(label != w for w, _ in wanted):
+                        trace(f"Skipping unselected file: {label}")
+                for label, link in wanted:
                     try:
                         trace(f"Requesting: {label}")
+                        future = tracker.expect(ambientcg.link_stem(link.get_attribute("href")) or asset_id)
+                        pacing.wait()  # Each click is a file request to the site
                         driver.execute_script("arguments[0].click();", link)
-                        clicked_count += 1
-                        time.sleep(1.2)
+                        clicked.append(future)
                     except Exception as click_err:
                         trace(f"Failed to click {label}: {click_err}")
                         log_failure(download_dir, asset_id, label, str(click_err))
 
-                if clicked_count > 0:
-                    with open(history_file, "a") as hf: hf.write(f"{asset_id}\n")
-                    stats["success"] += 1
+                if clicked:
+                    asset_futures[asset_id] = clicked
                 else:
-                    trace(f"Asset {asset_id} had links but none matched criteria (likely all JPG).")
-                
-                save_json(QUEUE_FILE, {"pending": queue})
-                time.sleep(random.uniform(*STAGGER_DELAY))
+                    trace(f"Asset {asset_id} had links but none matched the selection rules.")
+                    catalog.mark(AMBIENTCG, asset_id, "skipped")
+                    telemetry.event("asset_skipped", asset=asset_id)
+                    queue.done(asset_id)
 
             except Exception as e:
                 trace(f"CRITICAL ERROR on {asset_id}: {str(e)}")
                 log_failure(download_dir, asset_id, "CRITICAL", str(e))
-                stats["failed"] += 1
-                save_json(QUEUE_FILE, {"pending": queue})
+                fail_asset(asset_id, catalog, queue)
 
-        while get_active_downloads(download_dir) > 0:
-            trace("Waiting for final file transfers to finalize...")
-            time.sleep(5)
+        while tracker.pending() > 0:
+            trace(f"Waiting for final file transfers to finalize ({tracker.pending()} left)...")
+            tracker.wait_any(timeout=60)
+            tracker.expire(DOWNLOAD_TIMEOUT)
+        settle_assets(asset_futures, download_dir, catalog, queue)
+        tracker.close()
 
     finally:
-        trace(f"FULL SESSION COMPLETE. Success: {stats['success']} | Failed: {stats['failed']}")
+        if pipeline is not None:
+            trace("Waiting for queued extractions to finish...")
+            pipeline.close()
+        telemetry.close()
+        trace(f"FULL SESSION COMPLETE. Success: {stats['success']} | Failed: {stats['failed']} | Extracted: {stats['extracted']}")
         keyboard.unhook_all()
+        try: queue.close()
+        except: pass
         try: driver.quit()
         except: pass
         input("\nAutonomous Session Ended. Press Enter to close.")
@@ -1,14 +1,202 @@
 import c4d
 import os
+import sys
+import time
+import uuid
 from datetime import datetime
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BASE_DIR)
+for path in (REPO_ROOT, BASE_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from asset_tools.catalog import AssetCatalog
+from asset_tools.telemetry import Telemetry
+from asset_tools.texture_index import TextureIndex
+from import_planner import (ImportLog, describe_plan, next_library_path, plan_chunks, plan_import, resolve_texture,
+                            scan_library, stale_materials)
+
 # --- CONFIGURATION ---
 # [IMPORTANT] Update this path to your actual Extracted_Materials folder
 PARENT_DIRECTORY = r"C:\Users\tx3so\Downloads\C4DCenter-materials\Extracted_Materials"
+# Files already imported into the open scene (same size and mtime) are skipped; set True to import everything again.
+FORCE_FULL_IMPORT = False
+# Files are imported in chunks; the scene (or library file) is updated and memory released after each one.
+CHUNK_FILES = 100
+CHUNK_BYTES = 512 * 1024 * 1024  # A chunk also closes once its source scenes add up to this many bytes
+# True: write each chunk to its own library .c4d in LIBRARY_DIR instead of the open scene.
+LIBRARY_MODE = False
+LIBRARY_DIR = os.path.join(os.path.dirname(PARENT_DIRECTORY), "Material_Libraries")  # Outside the scanned tree
+# Give imported bitmap shaders absolute texture paths; missing ones are found by file name under PARENT_DIRECTORY.
+RELINK_TEXTURES = True
+# Application id of the unique-ID marker stored on every imported material (saved with the scene), so a
+# changed file's earlier materials are found exactly. 1000001-1000010 are Maxon's IDs for development;
+# use a registered plugin ID instead if another script of yours uses this one.
+IMPORT_MARKER_ID = 1000001
+
+
+def target_key(doc):
+    """Identifies the target scene in the import manifest by its saved path; None for an unsaved scene.
+
+    Every new session's scene is called "Untitled 1", so a name alone cannot tell scenes apart.
+    """
+    path = doc.GetDocumentPath()
+    return os.path.join(path, doc.GetDocumentName()) if path else None
+
+
+def material_marker(mat):
+    found = mat.FindUniqueID(IMPORT_MARKER_ID)
+    return bytes(found).decode("ascii", "replace") if found else None
+
+
+def remove_materials(doc, markers):
+    """Removes the materials carrying one of `markers`; the user's own and other files' materials are never touched."""
+    markers = set(markers)
+    removed = 0
+    for mat in doc.GetMaterials():
+        if material_marker(mat) in markers:
+            mat.Remove()
+            removed += 1
+    return removed
+
+
+def replace_stale(doc, stale):
+    """Removes a changed file's earlier import, listed in the manifest as [name, marker] pairs.
+
+    Entries written before markers existed only hold a name, which could just as well be the
+    user's material, so those are left in the scene and reported instead.
+    """
+    markers = [m[1] for m in stale if isinstance(m, list)]
+    unmarked = len(stale) - len(markers)
+    print(f"  [INFO] File changed; replaced {remove_materials(doc, markers)} earlier import(s)")
+    if unmarked:
+        print(f"  [INFO] {unmarked} material(s) from an older import have no marker; remove them by hand if unwanted")
+
+
+def iter_shaders(shader):
+    """Yields `shader`, its siblings and all their children (a material's shader tree)."""
+    while shader:
+        yield shader
+        yield from iter_shaders(shader.GetDown())
+        shader = shader.GetNext()
+
+
+def relink_textures(mat, source_dir, textures, stats, log):
+    """Points the material's bitmap shaders at absolute texture paths, using the texture index for missing ones."""
+    relinked = 0
+    for shader in iter_shaders(mat.GetFirstShader()):
+        if not shader.CheckType(c4d.Xbitmap):
+            continue
+        value = shader[c4d.BITMAPSHADER_FILENAME]
+        if not isinstance(value, str) or not value:
+            continue
+        found = resolve_texture(value, source_dir, textures)
+        if found is None:
+            stats["textures_missing"] += 1
+            log.note(f"    ! {mat.GetName()}: texture not found: {value}")
+        elif found != value:
+            shader[c4d.BITMAPSHADER_FILENAME] = found
+            relinked += 1
+    if relinked:
+        mat.Message(c4d.MSG_UPDATE)
+        stats["textures_relinked"] += relinked
+    return relinked
+
+
+def import_file(entry, dest_doc, stale, stats, log, telemetry, textures=None):
+    """Clones every material of one .c4d file into `dest_doc`; returns [name, marker] pairs, or None on failure.
+
+    The file's earlier import (`stale`) is removed only once every material has been imported; on
+    failure this run's materials are removed instead, so the scene keeps exactly one copy.
+    """
+    file_path = entry.path
+    filename = os.path.basename(file_path)
+
+    # Load the source document
+    source_doc = None
+    try:
+        with telemetry.span("load", file=filename):
+            source_doc = c4d.documents.LoadDocument(
+                file_path,
+                c4d.SCENEFILTER_MATERIALS | c4d.SCENEFILTER_MERGESCENE,
+                None
+            )
+    except Exception as e:
+        print(f"  [ERROR] Load failed: {e}")
+        stats["errors"] += 1
+        return None
+
+    if not source_doc:
+        print(f"  [ERROR] Could not load document")
+        stats["errors"] += 1
+        return None
+
+    import_start = time.perf_counter()
+    try:
+        # Set document path to help resolve texture paths
+        source_doc.SetDocumentPath(os.path.dirname(file_path))
+
+        # Get all materials from the source document
+        materials = source_doc.GetMaterials()
+        mat_count = len(materials) if materials else 0
+
+        if mat_count == 0:
+            print(f"  [INFO] No materials found")
+            if stale:
+                replace_stale(dest_doc, stale)
+            stats["files_processed"] += 1
+            return []
+
+        print(f"  [INFO] Found {mat_count} material(s)")
+
+        # Import each material
+        imported = []
+        file_errors = stats["errors"]
+        for mat in materials:
+            mat_name = mat.GetName()
+            try:
+                # Clone the material with all its data including textures
+                cloned_mat = mat.GetClone(c4d.COPYFLAGS_NONE)
+
+                if not cloned_mat:
+                    print(f"    ✗ {mat_name} - Clone failed")
+                    stats["errors"] += 1
+                    continue
+
+                if textures is not None:
+                    relink_textures(cloned_mat, os.path.dirname(file_path), textures, stats, log)
+                marker = uuid.uuid4().hex
+                cloned_mat.AddUniqueID(IMPORT_MARKER_ID, marker.encode("ascii"))
+                dest_doc.InsertMaterial(cloned_mat)
+                stats["materials_imported"] += 1
+                imported.append([mat_name, marker])
+                log.material(mat_name, filename)
+                print(f"    ✓ {mat_name}")
+
+            except Exception as e:
+                print(f"    ✗ {mat_name} - {e}")
+                stats["errors"] += 1
+
+        stats["files_processed"] += 1
+        telemetry.observe("import", time.perf_counter() - import_start, file=filename, materials=mat_count)
+        # Files with failed materials are not recorded, so they are retried next run
+        if stats["errors"] != file_errors:
+            stats["materials_imported"] -= remove_materials(dest_doc, [marker for _, marker in imported])
+            print(f"  [INFO] Import incomplete; this file's materials were removed and it will be retried")
+            return None
+        if stale:
+            replace_stale(dest_doc, stale)
+        return imported
+
+    finally:
+        # Clean up the source document
+        if source_doc:
+            c4d.documents.KillDocument(source_doc)
 
 
 def import_materials_to_scene():
-    """Import all materials from .c4d files into the currently open Cinema 4D scene."""
+    """Import materials from new or changed .c4d files into the open scene (or chunked library files)."""
     print("--- Material Import to Current Scene ---")
     print(f"[INFO] Source: {PARENT_DIRECTORY}")
     
@@ -22,128 +210,127 @@ def import_materials_to_scene():
         print("[ERROR] No active document found. Please open a scene first.")
         return
     
-    print(f"[INFO] Target: {doc.GetDocumentName()}")
-    
-    # Create log file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"material_import_log_{timestamp}.txt"
-    log_path = os.path.join(PARENT_DIRECTORY, log_filename)
-    imported_materials = []
-    
-    stats = {"files_processed": 0, "materials_imported": 0, "errors": 0}
+    target_name = f"library files in {LIBRARY_DIR}" if LIBRARY_MODE else doc.GetDocumentName()
+    print(f"[INFO] Target: {target_name}")
     
-    # Collect all .c4d files
-    c4d_files = []
-    for root, dirs, files in os.walk(PARENT_DIRECTORY):
-        for file in files:
-            if file.lower().endswith(".c4d"):
-                c4d_files.append(os.path.join(root, file))
-    
-    total_files = len(c4d_files)
-    print(f"[INFO] Found {total_files} material file(s) to process\n")
-    
-    for idx, file_path in enumerate(c4d_files, 1):
-        filename = os.path.basename(file_path)
-        print(f"[{idx}/{total_files}] {filename}")
-        
-        # Load the source document
-        source_doc = None
-        try:
-            source_doc = c4d.documents.LoadDocument(
-                file_path,
-                c4d.SCENEFILTER_MATERIALS | c4d.SCENEFILTER_MERGESCENE,
-                None
-            )
-        except Exception as e:
-            print(f"  [ERROR] Load failed: {e}")
-            stats["errors"] += 1
-            continue
-        
-        if not source_doc:
-            print(f"  [ERROR] Could not load document")
-            stats["errors"] += 1
-            continue
-        
+    stats = {"files_processed": 0, "materials_imported": 0, "errors": 0, "unchanged": 0, "chunks": 0,
+             "textures_relinked": 0, "textures_missing": 0}
+    with AssetCatalog() as catalog:
+        telemetry = Telemetry("c4d_importer")
+        target = f"library:{os.path.abspath(LIBRARY_DIR)}" if LIBRARY_MODE else target_key(doc)
+        if target is None:
+            print("[INFO] The scene has not been saved yet, so everything is imported and no import manifest is kept.")
+            print("[INFO] Save the scene before importing to make later runs incremental.")
+
+        # Scan the library and plan against the import manifest
+        with telemetry.span("scan") as span:
+            library = scan_library(PARENT_DIRECTORY)
+            manifest = {} if FORCE_FULL_IMPORT or target is None else catalog.import_entries(target)
+            plan = plan_import(library, manifest)
+            span["files"] = len(library)
+        print(f"[INFO] {len(library)} material file(s): {describe_plan(plan)}")
+        stats["unchanged"] = len(plan.unchanged)
+        if target is not None:
+            catalog.forget_imports(plan.removed, target)
+
+        # Earlier copies only live in the open scene; library files are never edited after they are written.
+        stale = {} if LIBRARY_MODE else stale_materials(plan, manifest)
+        c4d_files = plan.new + plan.changed
+        chunks = plan_chunks(c4d_files, CHUNK_FILES, CHUNK_BYTES)
+        total_files = len(c4d_files)
+        print(f"[INFO] {total_files} file(s) to import in {len(chunks)} chunk(s)\n")
+
+        # Texture name -> path index, refreshed from its cache (only folders whose mtime changed are re-listed)
+        textures = None
+        if RELINK_TEXTURES and c4d_files:
+            with telemetry.span("texture_index") as span:
+                textures = TextureIndex(PARENT_DIRECTORY)
+                rescanned, folders = textures.load()
+                span.update(folders=folders, rescanned=rescanned, textures=len(textures))
+            print(f"[INFO] Texture index: {len(textures)} texture(s) in {folders} folder(s), {rescanned} folder(s) rescanned\n")
+
+        # The log is streamed to disk as materials are imported
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = os.path.join(PARENT_DIRECTORY, f"material_import_log_{timestamp}.txt")
+        log = ImportLog(log_path, [f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                                   f"Source: {PARENT_DIRECTORY}", f"Target: {target_name}"])
+
+        idx = 0
         try:
-            # Set document path to help resolve texture paths
-            source_doc.SetDocumentPath(os.path.dirname(file_path))
-            
-            # Get all materials from the source document
-            materials = source_doc.GetMaterials()
-            mat_count = len(materials) if materials else 0
-            
-            if mat_count == 0:
-                print(f"  [INFO] No materials found")
-                stats["files_processed"] += 1
-                continue
-            
-            print(f"  [INFO] Found {mat_count} material(s)")
-            
-            # Import each material
-            for mat in materials:
-                mat_name = mat.GetName()
-                try:
-                    # Clone the material with all its data including textures
-                    cloned_mat = mat.GetClone(c4d.COPYFLAGS_NONE)
-                    
-                    if not cloned_mat:
-                        print(f"    ✗ {mat_name} - Clone failed")
-                        stats["errors"] += 1
-                        continue
-                    
-                    # Insert into active document
-                    doc.InsertMaterial(cloned_mat)
-                    stats["materials_imported"] += 1
-                    imported_materials.append(f"{mat_name} (from: {filename})")
-                    print(f"    ✓ {mat_name}")
-                    
-                except Exception as e:
-                    print(f"    ✗ {mat_name} - {e}")
-                    stats["errors"] += 1
-            
-            stats["files_processed"] += 1
-            
+            for chunk_num, chunk in enumerate(chunks, 1):
+                dest_doc = c4d.documents.BaseDocument() if LIBRARY_MODE else doc
+                recorded = []
+                for entry in chunk:
+                    idx += 1
+                    print(f"[{idx}/{total_files}] {os.path.basename(entry.path)}")
+                    names = import_file(entry, dest_doc, stale.get(entry.path), stats, log, telemetry, textures)
+                    if names is not None:
+                        recorded.append((entry, names))
+
+                with telemetry.span("chunk_finish", chunk=chunk_num, files=len(chunk)):
+                    if LIBRARY_MODE:
+                        library_path = next_library_path(LIBRARY_DIR)
+                        saved = c4d.documents.SaveDocument(dest_doc, library_path, c4d.SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST,
+                                                           c4d.FORMAT_C4DEXPORT)
+                        c4d.documents.KillDocument(dest_doc)  # Release the chunk before loading the next one
+                        if not saved:
+                            print(f"  [ERROR] Could not save {library_path}; chunk {chunk_num} will be retried")
+                            stats["errors"] += 1
+                            recorded = []
+                        else:
+                            log.note(f"  -> chunk {chunk_num} saved to {os.path.basename(library_path)}")
+                    else:
+                        c4d.EventAdd()  # Show this chunk's materials now instead of once at the very end
+
+                # Manifest entries are written only once the chunk has landed in the scene or on disk
+                for entry, names in recorded:
+                    catalog.set_file_status(entry.path, "imported")
+                    if target is not None:
+                        catalog.record_import(entry.path, target, entry.size, entry.mtime_ns, names)
+                log.flush()
+                stats["chunks"] += 1
+                c4d.StatusSetText(f"Imported {idx}/{total_files} material files")
+                c4d.StatusSetBar(int(idx * 100 / max(total_files, 1)))
+                print(f"[CHUNK {chunk_num}/{len(chunks)}] {len(chunk)} file(s) done\n")
         finally:
-            # Clean up the source document
-            if source_doc:
-                c4d.documents.KillDocument(source_doc)
-    
-    # Update the scene
-    c4d.EventAdd()
-    
-    # Write log file
-    try:
-        with open(log_path, 'w', encoding='utf-8') as log_file:
-            log_file.write("=" * 60 + "\n")
-            log_file.write("       C4D CENTER MATERIAL IMPORT LOG\n")
-            log_file.write("=" * 60 + "\n")
-            log_file.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            log_file.write(f"Source: {PARENT_DIRECTORY}\n")
-            log_file.write(f"Target Scene: {doc.GetDocumentName()}\n")
-            log_file.write("=" * 60 + "\n\n")
-            log_file.write(f"Files Processed: {stats['files_processed']}\n")
-            log_file.write(f"Materials Imported: {stats['materials_imported']}\n")
-            log_file.write(f"Errors: {stats['errors']}\n\n")
-            log_file.write("-" * 60 + "\n")
-            log_file.write("IMPORTED MATERIALS:\n")
-            log_file.write("-" * 60 + "\n")
-            for mat_entry in imported_materials:
-                log_file.write(f"  • {mat_entry}\n")
-            log_file.write("\n" + "=" * 60 + "\n")
-        print(f"\n[LOG] Import log saved to: {log_path}")
-    except Exception as e:
-        print(f"\n[WARNING] Could not write log file: {e}")
-    
-    print("\n" + "="*60)
-    print("              IMPORT SUMMARY")
-    print("="*60)
-    print(f"  Files Processed:       {stats['files_processed']}")
-    print(f"  Materials Imported:    {stats['materials_imported']}")
-    print(f"  Errors:                {stats['errors']}")
-    print("="*60)
-    print("\n[SUCCESS] Materials have been imported to your current scene!")
-    print("[INFO] Check the Material Manager to see all imported materials.")
+            c4d.StatusClear()
+            if textures is not None:
+                try:
+                    textures.save()
+                except OSError as e:
+                    print(f"[WARNING] Could not save texture index: {e}")
+            summary = [f"Files Processed: {stats['files_processed']}",
+                       f"Files Unchanged (skipped): {stats['unchanged']}",
+                       f"Materials Imported: {stats['materials_imported']}",
+                       f"Chunks: {stats['chunks']}",
+                       f"Textures Relinked: {stats['textures_relinked']}",
+                       f"Textures Not Found: {stats['textures_missing']}",
+                       f"Errors: {stats['errors']}"]
+            try:
+                log.close(summary)
+                print(f"\n[LOG] Import log saved to: {log_path}")
+            except Exception as e:
+                print(f"\n[WARNING] Could not write log file: {e}")
+            telemetry.close()
+
+        print("\n" + "="*60)
+        print("              IMPORT SUMMARY")
+        print("="*60)
+        print(f"  Files Processed:       {stats['files_processed']}")
+        print(f"  Unchanged (skipped):   {stats['unchanged']}")
+        print(f"  Materials Imported:    {stats['materials_imported']}")
+        print(f"  Chunks:                {stats['chunks']}")
+        print(f"  Textures Relinked:     {stats['textures_relinked']}")
+        print(f"  Textures Not Found:    {stats['textures_missing']}")
+        print(f"  Errors:                {stats['errors']}")
+        print("="*60)
+        if LIBRARY_MODE:
+            print(f"\n[SUCCESS] Materials have been written to library files in {LIBRARY_DIR}")
+            print("[INFO] Open or merge those files to use the materials.")
+        else:
+            print("\n[SUCCESS] Materials have been imported to your current scene!")
+            print("[INFO] Check the Material Manager to see all imported materials.")
 
 
 if __name__ == '__main__':
-    import_materials_to_scene()
\ No newline at end of file
+    import_materials_to_scene()
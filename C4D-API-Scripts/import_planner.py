@@ -0,0 +1,143 @@
+import os
+from collections import namedtuple
+
+# Planning half of c4d-importer.py. It never imports `c4d`, so it also runs outside Cinema 4D
+# (see benchmarks/bench_import_plan.py, which drives the importer against a stub `c4d` module).
+
+# --- 1. LIBRARY SCAN ---
+
+LibraryFile = namedtuple("LibraryFile", ["path", "size", "mtime_ns"])
+ImportPlan = namedtuple("ImportPlan", ["new", "changed", "unchanged", "removed"])
+
+
+def scan_library(root, extension=".c4d"):
+    """Every `extension` file under `root` with its size and mtime, from one scandir pass per folder."""
+    found = []
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.name.lower().endswith(extension):
+                st = entry.stat()
+                found.append(LibraryFile(os.path.abspath(entry.path), st.st_size, st.st_mtime_ns))
+    found.sort()
+    return found
+
+
+# --- 2. PLAN ---
+
+def plan_import(files, manifest):
+    """Splits the scanned `files` against `manifest` {path: {size, mtime_ns, materials}} for one target.
+
+    A file is unchanged when its size and mtime match the manifest entry written when it was last
+    imported into the same target document; `removed` lists manifest paths no longer on disk.
+    """
+    new, changed, unchanged = [], [], []
+    on_disk = set()
+    for f in files:
+        on_disk.add(f.path)
+        entry = manifest.get(f.path)
+        if entry is None:
+            new.append(f)
+        elif entry["size"] != f.size or entry["mtime_ns"] != f.mtime_ns:
+            changed.append(f)
+        else:
+            unchanged.append(f)
+    removed = sorted(path for path in manifest if path not in on_disk)
+    return ImportPlan(new, changed, unchanged, removed)
+
+
+def stale_materials(plan, manifest):
+    """Materials imported earlier from files that changed since ([name, marker] pairs), which should be replaced."""
+    return {f.path: manifest[f.path]["materials"] for f in plan.changed if manifest[f.path].get("materials")}
+
+
+def describe_plan(plan):
+    return (f"{len(plan.new)} new, {len(plan.changed)} changed, {len(plan.unchanged)} unchanged, "
+            f"{len(plan.removed)} removed since the last import")
+
+
+# --- 3. CHUNKS ---
+
+def plan_chunks(files, chunk_files=100, chunk_bytes=None):
+    """Groups `files` into import chunks of at most `chunk_files` files (and roughly `chunk_bytes` of scenes).
+
+    Memory in Cinema 4D grows with what one chunk holds, so large scenes close a chunk early.
+    """
+    chunks, current, size = [], [], 0
+    for f in files:
+        if current and (len(current) >= chunk_files or (chunk_bytes and size + f.size > chunk_bytes)):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(f)
+        size += f.size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def next_library_path(directory, prefix="Material_Library_"):
+    """Next unused `<prefix>NNNN.c4d` in `directory`, so each chunk gets its own library file."""
+    os.makedirs(directory, exist_ok=True)
+    taken = [name[len(prefix):-4] for name in os.listdir(directory)
+             if name.startswith(prefix) and name.lower().endswith(".c4d")]
+    numbers = [int(n) for n in taken if n.isdigit()]
+    return os.path.join(directory, f"{prefix}{max(numbers, default=0) + 1:04d}.c4d")
+
+
+# --- 4. TEXTURE RELINK ---
+
+def resolve_texture(value, source_dir, index):
+    """Absolute path a bitmap shader should use once its material leaves the source scene, or None.
+
+    Relative paths only resolve against the scene they were saved in, so they are made absolute when the
+    file is next to the source scene; anything else that no longer exists is looked up by file name.
+    """
+    if os.path.isabs(value) and os.path.isfile(value):
+        return value
+    for candidate in (os.path.join(source_dir, value), os.path.join(source_dir, "tex", value)):
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+    return index.lookup(value, near=source_dir)
+
+
+# --- 5. STREAMING LOG ---
+
+class ImportLog:
+    """Import log written as the run goes: header first, one line per material, summary at the end.
+
+    Lines are buffered by the file object and flushed after every chunk, so nothing accumulates in
+    memory and an interrupted run still leaves a log of everything imported so far.
+    """
+
+    RULE = "=" * 60
+
+    def __init__(self, path, header):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(f"{self.RULE}\n       C4D CENTER MATERIAL IMPORT LOG\n{self.RULE}\n")
+        for line in header:
+            self._file.write(line + "\n")
+        self._file.write(f"{self.RULE}\n\n" + "-" * 60 + "\nIMPORTED MATERIALS:\n" + "-" * 60 + "\n")
+
+    def material(self, name, source_file):
+        self._file.write(f"  • {name} (from: {source_file})\n")
+
+    def note(self, text):
+        self._file.write(f"{text}\n")
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self, summary):
+        self._file.write(f"\n{self.RULE}\n")
+        for line in summary:
+            self._file.write(line + "\n")
+        self._file.write(f"{self.RULE}\n")
+        self._file.close()
@@ -1,16 +1,27 @@
 import time
 import os
-import random
 import sys
 import json
+import threading
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from asset_tools import c4dcenter
+from asset_tools.browser import resolve_driver, start_chrome
+from asset_tools.browser_pool import BrowserPool, session_dir
+from asset_tools.catalog import AssetCatalog, C4DCENTER
+from asset_tools.extraction import describe
+from asset_tools.http_client import make_session
+from asset_tools.pipeline import ExtractionPipeline
+from asset_tools.rate_limit import AdaptiveRateLimiter
+from asset_tools.telemetry import Telemetry
 
 # --- 1. CONFIGURATION & CONFIG HELPERS ---
 
@@ -64,6 +75,16 @@ def validate_int(val):
 
 # --- 2. BROWSER SETUP & LOGIC ---
 
+DOWNLOAD_TIMEOUT = 300  # Seconds to wait for a browser download to finish before counting it as an error
+LISTING_WORKERS = 4     # Most listing pages fetched in parallel during indexing
+# Request pacing adapts to the server (asset_tools/rate_limit.py): while responses are quick and healthy the
+# rate (requests/s) climbs toward its maximum; 429/503s, timeouts and slow pages halve it, and a Retry-After
+# pauses every worker. The jitter is random extra spacing kept on every request, however fast the rate gets.
+LISTING_RATE, LISTING_MAX_RATE = 3.0, 8.0
+LISTING_JITTER = (0.0, 0.25)
+PRODUCT_RATE, PRODUCT_MIN_RATE, PRODUCT_MAX_RATE = 1.0, 0.05, 2.0  # Across all browser sessions
+PRODUCT_JITTER = (0.2, 1.5)  # At the starting rate: the same 1.2-2.5s spacing as the old fixed delay
+
 def run_scraper():
     print("--- C4D Center Scraper (v1.1) ---")
 
@@ -71,6 +92,8 @@ def run_scraper():
     config = load_config()
     saved_path = config.get("download_path")
     
+    BASE_URL = config.get("base_url", c4dcenter.BASE_URL)
+
     if saved_path and os.path.exists(saved_path):
         print(f"[INFO] Using remembered path: {saved_path}")
         DOWNLOAD_DIR = saved_path
@@ -81,63 +104,186 @@ def run_scraper():
     HEADLESS_MODE = get_input("2. Run in Headless Mode? (y/n): ", validate_bool)
     START_PAGE = get_input("3. Enter Start Page: ", validate_int)
     END_PAGE = get_input("4. Enter End Page: ", validate_int)
+    DIRECT_MODE = get_input("5. Use direct form downloads (no product page render)? (y/n): ", validate_bool)
+    EXTRACT_LIVE = get_input("6. Extract archives as they finish downloading? (y/n): ", validate_bool)
+    SESSIONS = 1 if DIRECT_MODE else get_input("7. Number of parallel browser sessions (1 = single browser): ", validate_int)
 
     # Statistics
-    stats = {"total_found": 0, "downloaded": 0, "skipped": 0, "errors": 0}
-    
-    chrome_options = Options()
-    if HEADLESS_MODE:
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--window-size=1920,1080")
+    stats = {"total_found": 0, "downloaded": 0, "skipped": 0, "errors": 0, "extracted": 0}
+    stats_lock = threading.Lock()
+
+    def count(key):
+        with stats_lock:
+            stats[key] += 1
+
+    catalog = AssetCatalog()
+    telemetry = Telemetry("c4dcenter")  # ../telemetry/c4dcenter.events.jsonl + Prometheus textfile
+    imported = catalog.import_directory(C4DCENTER, DOWNLOAD_DIR, c4dcenter.slug_from_filename)
+    if imported:
+        print(f"[INFO] Indexed {imported} new archive(s) from the download folder into the asset catalog.")
+
+    def report_extraction(result):
+        name = os.path.basename(result["path"])
+        telemetry.observe(result["stage"], result.get("seconds") or 0.0, result.get("bytes") if result["ok"] else None,
+                          archive=name, ok=result["ok"])
+        if result["stage"] == "extract":
+            catalog.record_extraction(result)
+        if result["ok"]:
+            print(f"  [EXTRACTED] {name}: {describe(result)}")
+            catalog.set_file_status(result["path"], "extracted")
+            count("extracted")
+        else:
+            print(f"  [{result['stage'].upper()} FAILED] {name}: {result['error']}")
+            catalog.set_file_status(result["path"], "corrupt" if result["stage"] == "verify" else "extract_failed")
+
+    pipeline = None
+    if EXTRACT_LIVE:
+        pipeline = ExtractionPipeline(os.path.join(DOWNLOAD_DIR, "Extracted_Materials"), on_result=report_extraction)
     
-    chrome_options.add_experimental_option("prefs", {
-        "download.default_directory": DOWNLOAD_DIR,
-        "profile.managed_default_content_settings.images": 2 
-    })
-    chrome_options.page_load_strategy = 'eager'
+    resolve_start = time.perf_counter()
+    driver_path, driver_source = resolve_driver()
+    print(f"[INFO] ChromeDriver from {driver_source} in {time.perf_counter() - resolve_start:.2f}s")
+
+    def make_driver(download_dir, index=0):
+        chrome_options = Options()
+        if HEADLESS_MODE or download_dir != DOWNLOAD_DIR:
+            # Extra sessions always run headless; only the first browser is ever shown.
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+
+        chrome_options.add_experimental_option("prefs", {
+            "download.default_directory": download_dir,
+            "profile.managed_default_content_settings.images": 2
+        })
+        chrome_options.page_load_strategy = 'eager'
+        # Each session keeps its own persistent profile, so later runs start warm.
+        new_driver, seconds = start_chrome(chrome_options, driver_path, profile=f"c4dcenter-{index}")
+        print(f"[INFO] Browser session {index} ready in {seconds:.1f}s")
+        return new_driver
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    driver = make_driver(DOWNLOAD_DIR)
     downloaded_filenames = []
+    session = make_session(pool_size=LISTING_WORKERS + 1)
+    product_limiter = AdaptiveRateLimiter(PRODUCT_RATE, min_rate=PRODUCT_MIN_RATE, max_rate=PRODUCT_MAX_RATE,
+                                          max_concurrency=SESSIONS, jitter=PRODUCT_JITTER,
+                                          on_change=lambda message: print(f"[RATE] Products: {message}"))
 
     try:
-        for page_num in range(START_PAGE, END_PAGE + 1):
-            url = "https://c4dcenter.com/material-library/" if page_num == 1 else f"https://c4dcenter.com/material-library/page/{page_num}/"
-            print(f"\n--- Page {page_num} of {END_PAGE} ---")
-            driver.get(url)
-            
+        # Harvest cookies once; direct mode needs no browser after this.
+        driver.get(c4dcenter.listing_url(1, BASE_URL))
+        c4dcenter.adopt_browser_session(driver, session)
+        if DIRECT_MODE:
+            driver.quit()
+            driver = None
+
+        print(f"\n--- Indexing pages {START_PAGE}-{END_PAGE} ---")
+        index_start = time.time()
+        with telemetry.span("index", pages=END_PAGE - START_PAGE + 1) as span:
+            urls, failed_pages = c4dcenter.crawl_listing_pages(
+                c4dcenter.http_fetcher(session), range(START_PAGE, END_PAGE + 1), base_url=BASE_URL,
+                max_workers=LISTING_WORKERS,
+                limiter=AdaptiveRateLimiter(LISTING_RATE, max_rate=LISTING_MAX_RATE, concurrency=LISTING_WORKERS,
+                                            jitter=LISTING_JITTER,
+                                            on_change=lambda message: print(f"[RATE] Listing: {message}")),
+                on_page=lambda page_num, links: print(f"  Page {page_num}: {len(links)} product(s)"))
+            span["products"] = len(urls)
+        for page_num, err in failed_pages:
+            print(f"Error loading page {page_num}: {err}")
+        stats["total_found"] = len(urls)
+        print(f"[INFO] Indexed {len(urls)} product(s) in {time.time() - index_start:.1f}s")
+
+        def record(slug, path, size):
+            telemetry.event("product_downloaded", product=slug)
+            catalog.add_file(C4DCENTER, slug, path, size)
+            catalog.mark(C4DCENTER, slug)
+            count("downloaded")
+            downloaded_filenames.append(slug)
+            if pipeline:
+                pipeline.submit(path)
+
+        def claim(idx, target_url):
+            """Returns the product slug, or None when it is already in the catalog."""
+            slug = c4dcenter.product_slug(target_url)
+            if catalog.has_matching(C4DCENTER, slug):
+                print(f"Skipping: {slug} (Exists)")
+                count("skipped")
+                telemetry.event("product_skipped", product=slug)
+                return None
+            print(f"[{idx}/{len(urls)}] Downloading: {slug}...")
+            return slug
+
+        def browser_download(worker, item):
+            idx, target_url = item
+            slug = claim(idx, target_url)
+            if slug is None:
+                return
             try:
-                WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "ul.products")))
-                all_links = driver.find_elements(By.CSS_SELECTOR, "ul.products li.product a.woocommerce-LoopProduct-link")
-                urls = list(dict.fromkeys([l.get_attribute("href") for l in all_links]))
-                stats["total_found"] += len(urls)
-
-                for target_url in urls:
-                    slug = target_url.strip("/").split("/")[-1]
-                    
-                    # Check for duplicates in folder
-                    if any(slug in f.lower() for f in os.listdir(DOWNLOAD_DIR)):
-                        print(f"Skipping: {slug} (Exists)")
-                        stats["skipped"] += 1
-                        continue
-
-                    print(f"Downloading: {slug}...")
-                    time.sleep(random.uniform(1.0, 2.5))
-                    
-                    driver.get(target_url)
-                    try:
-                        btn = WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, "somdn-form-submit-button")))
-                        driver.execute_script("arguments[0].click();", btn)
-                        
-                        # Wait logic... (Simplified for brevity)
-                        time.sleep(5) 
-                        stats["downloaded"] += 1
-                        downloaded_filenames.append(slug)
-                    except:
-                        stats["errors"] += 1
-            except:
-                print(f"Error loading page {page_num}")
+                # Only the page load counts toward the rate controller's latency and concurrency
+                with product_limiter.request() as pacing:
+                    telemetry.observe("rate_limit_wait", pacing["waited"], product=slug)
+                    with telemetry.span("page_load", product=slug, session=worker.index):
+                        worker.driver.get(target_url)
+                        btn = WebDriverWait(worker.driver, 10).until(EC.element_to_be_clickable((By.ID, "somdn-form-submit-button")))
+                finished = worker.tracker.expect(slug, key=c4dcenter.slug_from_filename)
+                worker.driver.execute_script("arguments[0].click();", btn)
+
+                result = finished.result(timeout=DOWNLOAD_TIMEOUT)
+                path = result.path
+                if worker.download_dir != DOWNLOAD_DIR:
+                    path = os.path.join(DOWNLOAD_DIR, os.path.basename(result.path))
+                    os.replace(result.path, path)
+                print(f"  Saved {os.path.basename(path)} ({result.size / 1048576:.1f} MB in {result.duration:.1f}s)")
+                telemetry.observe("transfer", result.duration, result.size, product=slug, mode="browser")
+                record(slug, path, result.size)
+            except Exception as e:
+                print(f"  Download failed ({slug}): {e!r}")
+                worker.tracker.expire(0)
+                count("errors")
+                telemetry.event("product_failed", product=slug)
+
+        if DIRECT_MODE:
+            for idx, target_url in enumerate(urls, 1):
+                slug = claim(idx, target_url)
+                if slug is None:
+                    continue
+                try:
+                    with product_limiter.request() as pacing:
+                        telemetry.observe("rate_limit_wait", pacing["waited"], product=slug)
+                        with telemetry.span("transfer", product=slug, mode="direct") as span:
+                            path, size = c4dcenter.download_product(session, target_url, DOWNLOAD_DIR)
+                            span["bytes"] = size
+                        pacing["seconds"] = None  # Transfer time says nothing about server load
+                    print(f"  Saved {os.path.basename(path)} ({size / 1048576:.1f} MB)")
+                    record(slug, path, size)
+                except Exception as e:
+                    print(f"  Direct download failed: {e}")
+                    count("errors")
+                    telemetry.event("product_failed", product=slug)
+        else:
+            # Session 0 reuses the browser that harvested the cookies; the pool quits it when done.
+            first_driver, driver = driver, None
+
+            def open_session(index):
+                directory = session_dir(DOWNLOAD_DIR, index)
+                return (first_driver if index == 0 else make_driver(directory, index)), directory
+
+            pool = BrowserPool(open_session, sessions=SESSIONS, close_session=lambda d: d.quit())
+            if SESSIONS > 1:
+                print(f"[INFO] Downloading with {SESSIONS} browser sessions...")
+            left = pool.run(list(enumerate(urls, 1)), browser_download)
+            for index, err in pool.errors:
+                print(f"[WARN] Browser session {index} failed to start: {err}")
+            if left:
+                print(f"[WARN] {len(left)} product(s) were not attempted.")
+                stats["errors"] += len(left)
+        print(f"[INFO] Final product pacing: {product_limiter.describe()}")
 
     finally:
+        if pipeline:
+            print("\n[INFO] Waiting for queued extractions to finish...")
+            pipeline.close()
+            print(f"[INFO] Extracted {stats['extracted']} archive(s) during the session.")
+
         # Final Log
         if downloaded_filenames:
             log_name = f"log_c4d_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -145,7 +291,10 @@ def run_scraper():
                 f.write("\n".join(downloaded_filenames))
             print(f"\nSession complete. Log saved to your download folder.")
         
-        driver.quit()
+        telemetry.close()
+        catalog.close()
+        if driver:
+            driver.quit()
 
 if __name__ == "__main__":
     run_scraper()
\ No newline at end of file
@@ -0,0 +1 @@
+"""Shared helpers for the C4DCenter / AmbientCG scrapers, the extractor and the C4D importer."""
@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import time
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, parse_qs
+
+# --- 1. SITE CONSTANTS ---
+
+BASE_URL = "https://ambientcg.com"
+API_PATH = "/api/v2/full_json"
+API_PAGE_SIZE = 100
+
+
+def view_url(asset_id, base_url=BASE_URL):
+    return f"{base_url.rstrip('/')}/view?id={asset_id}"
+
+
+def link_stem(url):
+    """'.../get?file=Bricks076C_1K-PNG.zip' -> 'Bricks076C_1K-PNG' (also matches Chrome's 'name (1).zip')."""
+    name = parse_qs(urlparse(url or "").query).get("file", [""])[0]
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+_ARCHIVE_RE = re.compile(r"^([A-Za-z0-9]+)_\d+K-[A-Za-z0-9]+(?: \(\d+\))?\.zip$", re.IGNORECASE)
+
+
+def asset_id_from_archive(path):
+    """'Bricks076C_1K-PNG.zip' -> 'Bricks076C'; None for names that are not AmbientCG archives."""
+    match = _ARCHIVE_RE.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+# --- 2. LABEL PARSING ---
+
+_SIZE_RE = re.compile(r"([\d.,]+)\s*(B|KB|MB|GB|TB)\b", re.IGNORECASE)
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def parse_size_label(label):
+    """'8K-PNG .zip 652 MB' -> 683671552. Returns None when the label carries no size."""
+    match = _SIZE_RE.search(label or "")
+    if not match:
+        return None
+    return int(float(match.group(1).replace(",", "")) * _UNITS[match.group(2).upper()])
+
+
+# --- 3. VIEW PAGE PARSING ---
+
+class _DownloadLinkParser(HTMLParser):
+    """Collects every <a href="...get?file=..."> with the same visible label Selenium's `.text` returns."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self._href = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = dict(attrs).get("href") or ""
+        if "get?file=" in href:
+            self._href = href
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            label = " ".join(" ".join(self._text).split())
+            self.links.append((label, self._href))
+            self._href = None
+
+
+def parse_download_links(html, base_url=BASE_URL):
+    """Returns [(label, absolute_url), ...] for all download buttons on a view page."""
+    parser = _DownloadLinkParser()
+    parser.feed(html)
+    parser.close()
+    seen = set()
+    links = []
+    for label, href in parser.links:
+        url = urljoin(base_url.rstrip("/") + "/", href)
+        if url in seen:
+            continue
+        seen.add(url)
+        links.append((label, url))
+    return links
+
+
+def fetch_download_links(session, asset_id, base_url=BASE_URL, timeout=(10, 30)):
+    """Downloads the view page for `asset_id` without a browser and parses its download links."""
+    response = session.get(view_url(asset_id, base_url), timeout=timeout)
+    response.raise_for_status()
+    return parse_download_links(response.text, base_url)
+
+
+# --- 4. INCREMENTAL INDEX ---
+
+def fetch_asset_page(session, offset, limit=API_PAGE_SIZE, sort="Latest", base_url=BASE_URL, timeout=(10, 30)):
+    """Returns (asset_ids, total) for one page of the public listing API, newest first by default."""
+    response = session.get(f"{base_url.rstrip('/')}{API_PATH}",
+                           params={"sort": sort, "limit": limit, "offset": offset}, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    ids = [a["assetId"] for a in data.get("foundAssets", []) if a.get("assetId")]
+    return ids, data.get("numberOfResults")
+
+
+def load_cursor(path):
+    if not os.path.exists(path):
+        return {"backfill_offset": 0, "complete": False}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_cursor(path, cursor):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cursor, f)
+    os.replace(tmp, path)
+
+
+def iter_new_assets(session, known, cursor, base_url=BASE_URL, page_size=API_PAGE_SIZE, known_run=20,
+                    page_delay=0.5, should_stop=None):
+    """Yields (new_ids, cursor) one listing page at a time, newest first.
+
+    Once a backfill has completed, only the head of the listing is read: paging stops as soon as
+    `known_run` consecutive ids are already in `known`, which costs one or two requests per day.
+    An unfinished backfill (first run, or one interrupted by the stop hotkey) first checks the head
+    the same way and then resumes from `cursor["backfill_offset"]`. Persist the yielded cursor
+    together with the ids so a crash never skips a page.
+    """
+    seen = set(known)
+    should_stop = should_stop or (lambda: False)
+
+    def scan(offset, stop_on_known):
+        run = 0
+        while not should_stop():
+            ids, total = fetch_asset_page(session, offset, page_size, base_url=base_url)
+            if not ids:
+                yield [], offset, True
+                return
+            fresh = []
+            for asset_id in ids:
+                if asset_id in seen:
+                    run += 1
+                    continue
+                run = 0
+                seen.add(asset_id)
+                fresh.append(asset_id)
+            offset += len(ids)
+            hit_known = stop_on_known and run >= known_run
+            at_end = total is not None and offset >= total
+            yield fresh, offset, hit_known or at_end
+            if hit_known or at_end:
+                return
+            time.sleep(page_delay)
+
+    backfilling = not cursor.get("complete")
+    if cursor.get("complete") or cursor.get("backfill_offset", 0) > 0:
+        for fresh, _, _ in scan(0, True):
+            yield fresh, cursor
+
+    if backfilling:
+        for fresh, offset, finished in scan(cursor.get("backfill_offset", 0), False):
+            cursor["backfill_offset"] = offset
+            cursor["complete"] = finished
+            yield fresh, cursor
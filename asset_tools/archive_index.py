@@ -0,0 +1,45 @@
+import mmap
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+# --- 1. CENTRAL DIRECTORY READER ---
+
+def read_central_directory(zip_path):
+    """Worker entry point: lists an archive's members from its central directory only.
+
+    The archive is memory-mapped and zipfile seeks straight to the end-of-central-directory record,
+    so only the directory pages are ever read, never the compressed data. Returns a dict with the
+    archive's size, mtime_ns and (name, size, compressed_size, crc) rows, or an error string.
+    """
+    st = os.stat(zip_path)
+    entry = {"path": zip_path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "members": [], "error": None}
+    try:
+        with open(zip_path, "rb") as f:
+            if st.st_size == 0:
+                raise zipfile.BadZipFile("Empty file")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with zipfile.ZipFile(mapped) as archive:
+                    entry["members"] = [(i.filename, i.file_size, i.compress_size, i.CRC)
+                                        for i in archive.infolist() if not i.is_dir()]
+    except (zipfile.BadZipFile, OSError, ValueError) as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+# --- 2. INDEX BUILD ---
+
+def build_index(catalog, zip_paths, workers=None, on_entry=None):
+    """Indexes every archive whose size or mtime changed since its last index; returns (indexed, unchanged)."""
+    known = catalog.archive_index_stamps()
+    todo = []
+    for path in zip_paths:
+        st = os.stat(path)
+        if known.get(os.path.abspath(path)) != (st.st_size, st.st_mtime_ns):
+            todo.append(path)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for entry in pool.map(read_central_directory, todo, chunksize=32):
+            catalog.store_archive_index(entry)
+            if on_entry is not None:
+                on_entry(entry)
+    return len(todo), len(zip_paths) - len(todo)
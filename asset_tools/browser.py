@@ -0,0 +1,121 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# --- 1. LOCATIONS ---
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(REPO_ROOT, ".browser_cache")
+DRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "chromedriver.json")
+PROFILE_ROOT = os.path.join(CACHE_DIR, "profiles")
+
+CHROME_COMMANDS = {
+    "darwin": ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"],
+    "linux": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+}
+# Chrome flags that skip first-run work on every launch of a persistent profile.
+FAST_START_ARGS = ["--no-first-run", "--no-default-browser-check", "--disable-search-engine-choice-screen"]
+
+
+# --- 2. CHROME VERSION ---
+
+def chrome_version():
+    """Installed Chrome version ('120.0.6099.109'), read locally without any network access, or None."""
+    if sys.platform == "win32":
+        import winreg
+        for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(hive, r"Software\Google\Chrome\BLBeacon") as key:
+                    return winreg.QueryValueEx(key, "version")[0]
+            except OSError:
+                continue
+        return None
+    for command in CHROME_COMMANDS.get("darwin" if sys.platform == "darwin" else "linux", []):
+        try:
+            out = subprocess.run([command, "--version"], capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", out)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+# --- 3. DRIVER CACHE ---
+
+def _load_cache(cache_file):
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_file, cache):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp = cache_file + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, cache_file)
+
+
+def resolve_driver(cache_file=DRIVER_CACHE_FILE):
+    """Returns (driver_path, source) where source is "cache", "download" or "stale-cache".
+
+    The driver resolved for each Chrome major version is remembered in `cache_file`. While the
+    installed Chrome still has that major version the cached binary is used with no network access
+    at all. Otherwise webdriver-manager resolves a new driver; if that fails (e.g. the driver CDN is
+    unreachable) the most recently cached driver is tried anyway.
+    """
+    cache = _load_cache(cache_file)
+    major = _major(chrome_version())
+    entry = cache.get(major) if major else cache.get(cache.get("latest", ""))
+    if entry and os.path.exists(entry["path"]):
+        return entry["path"], "cache"
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception:
+        fallback = cache.get(cache.get("latest", ""))
+        if fallback and os.path.exists(fallback["path"]):
+            return fallback["path"], "stale-cache"
+        raise
+    key = major or "unknown"
+    cache[key] = {"path": path, "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    cache["latest"] = key
+    _save_cache(cache_file, cache)
+    return path, "download"
+
+
+# --- 4. WARM START ---
+
+def profile_dir(name):
+    """Persistent Chrome profile folder; reusing it keeps the disk cache, cookies and TLS state warm."""
+    path = os.path.join(PROFILE_ROOT, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def start_chrome(options, driver_path, profile=None):
+    """Launches Chrome with `options` and returns (driver, seconds).
+
+    With `profile`, the browser runs in the persistent profile of that name. Only one browser may use
+    a profile at a time, so parallel sessions need distinct names.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    if profile:
+        options.add_argument(f"--user-data-dir={profile_dir(profile)}")
+    for arg in FAST_START_ARGS:
+        options.add_argument(arg)
+    start = time.perf_counter()
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    return driver, time.perf_counter() - start
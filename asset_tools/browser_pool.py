@@ -0,0 +1,88 @@
+import os
+import queue
+import threading
+
+from asset_tools.completion import CompletionTracker
+
+# --- 1. WORKER STATE ---
+
+class BrowserWorker:
+    """One browser session of the pool: its driver, private download folder and completion tracker."""
+
+    def __init__(self, index, driver, download_dir):
+        self.index = index
+        self.driver = driver
+        self.download_dir = download_dir
+        self.tracker = CompletionTracker(download_dir)
+
+    def close(self):
+        self.tracker.close()
+
+
+# --- 2. POOL ---
+
+class BrowserPool:
+    """Runs `sessions` browser sessions, each pulling items from one shared queue.
+
+    `open_session(index)` returns (driver, download_dir) and is called on the worker's own thread,
+    so all browsers cold-start in parallel. Each session gets its own download folder so the
+    completion trackers never confuse each other's files. `close_session(driver)` runs when the
+    worker stops. Politeness is left to `handle(worker, item)`, which should pass through a limiter
+    shared by every session before touching the site. A session that fails to start only shrinks
+    the pool; its share of the queue goes to the others.
+    """
+
+    def __init__(self, open_session, sessions=2, close_session=None):
+        self.open_session = open_session
+        self.sessions = sessions
+        self.close_session = close_session
+        self.stop = threading.Event()
+        self.errors = []
+        self._queue = queue.Queue()
+
+    def run(self, items, handle):
+        """Processes every item (unless `stop` is set) and returns the items left unprocessed."""
+        for item in items:
+            self._queue.put(item)
+        threads = [threading.Thread(target=self._work, args=(i, handle), daemon=True) for i in range(self.sessions)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.5)  # Short joins keep Ctrl+C responsive on the main thread
+        finally:
+            self.stop.set()
+        left = []
+        while not self._queue.empty():
+            left.append(self._queue.get_nowait())
+        return left
+
+    def _work(self, index, handle):
+        try:
+            driver, download_dir = self.open_session(index)
+        except Exception as e:
+            self.errors.append((index, e))
+            return
+        worker = BrowserWorker(index, driver, download_dir)
+        try:
+            while not self.stop.is_set():
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                handle(worker, item)
+        finally:
+            worker.close()
+            if self.close_session is not None:
+                try:
+                    self.close_session(driver)
+                except Exception:
+                    pass
+
+
+def session_dir(download_dir, index):
+    """Download folder of session `index`; session 0 downloads straight into `download_dir`."""
+    path = download_dir if index == 0 else os.path.join(download_dir, f".session-{index}")
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,173 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlencode
+
+from asset_tools.http_client import stream_to_file
+
+# --- 1. SITE CONSTANTS ---
+
+BASE_URL = "https://c4dcenter.com"
+SUBMIT_BUTTON_ID = "somdn-form-submit-button"
+
+
+def listing_url(page_num, base_url=BASE_URL):
+    root = f"{base_url.rstrip('/')}/material-library/"
+    return root if page_num == 1 else f"{root}page/{page_num}/"
+
+
+def product_slug(product_url):
+    return product_url.strip("/").split("/")[-1]
+
+
+def slug_from_filename(name):
+    """'Wood_Planks 01.zip' -> 'wood-planks-01', matching the product slug used as catalog key."""
+    stem = os.path.splitext(os.path.basename(name))[0].lower()
+    return re.sub(r"[\s_]+", "-", stem).strip("-")
+
+
+# --- 2. LISTING CRAWL ---
+
+class _ProductLinkParser(HTMLParser):
+    """Equivalent of the CSS selector `ul.products li.product a.woocommerce-LoopProduct-link`."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self._stack = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "a" and "woocommerce-LoopProduct-link" in classes and attrs.get("href"):
+            if ("li", "product") in self._stack and ("ul", "products") in self._stack:
+                self.links.append(attrs["href"])
+        if tag in ("ul", "li"):
+            marker = "products" if tag == "ul" and "products" in classes else \
+                     "product" if tag == "li" and "product" in classes else None
+            self._stack.append((tag, marker))
+
+    def handle_endtag(self, tag):
+        if tag in ("ul", "li"):
+            for i in range(len(self._stack) - 1, -1, -1):
+                if self._stack[i][0] == tag:
+                    del self._stack[i:]
+                    break
+
+
+def parse_listing(html):
+    """Returns the de-duplicated product URLs of one material-library page, in page order."""
+    parser = _ProductLinkParser()
+    parser.feed(html)
+    parser.close()
+    return list(dict.fromkeys(parser.links))
+
+
+def http_fetcher(session, timeout=(10, 30)):
+    """Builds a `fetch(url) -> html` callable over a pooled session for `crawl_listing_pages`."""
+    def fetch(url):
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+    return fetch
+
+
+def crawl_listing_pages(fetch, pages, base_url=BASE_URL, max_workers=4, limiter=None, on_page=None):
+    """Fetches the listing `pages` concurrently and returns (product_urls, failed_pages).
+
+    `fetch(url)` returns page HTML (see `http_fetcher`; benchmarks pass a fixture reader). Every
+    request runs inside `limiter.request()`, so concurrency never raises the request rate above it
+    (and an `AdaptiveRateLimiter` sees every response time and HTTP error).
+    Products keep page order and appear once even when the listing shifts between requests.
+    """
+    def job(page_num):
+        with limiter.request() if limiter is not None else nullcontext():
+            html = fetch(listing_url(page_num, base_url))
+        return parse_listing(html)
+
+    by_page, failed = {}, []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(job, n): n for n in pages}
+        for fut in as_completed(futures):
+            page_num = futures[fut]
+            try:
+                by_page[page_num] = fut.result()
+            except Exception as e:
+                failed.append((page_num, str(e)))
+                continue
+            if on_page is not None:
+                on_page(page_num, by_page[page_num])
+    products = dict.fromkeys(url for n in sorted(by_page) for url in by_page[n])
+    return list(products), sorted(failed)
+
+
+# --- 3. SOMDN FORM PARSING ---
+
+class _SomdnFormParser(HTMLParser):
+    """Finds the <form> holding the somdn submit button and records its action and fields."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._current = {"action": attrs.get("action") or "", "method": (attrs.get("method") or "post").upper(),
+                             "fields": {}, "has_button": "somdn" in (attrs.get("class") or "")}
+            return
+        if self._current is None:
+            return
+        if attrs.get("id") == SUBMIT_BUTTON_ID:
+            self._current["has_button"] = True
+        if tag in ("input", "button") and attrs.get("name"):
+            input_type = (attrs.get("type") or "").lower()
+            if input_type in ("checkbox", "radio") and "checked" not in attrs:
+                return
+            self._current["fields"][attrs["name"]] = attrs.get("value") or ""
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == "form" and self._current is not None:
+            self.forms.append(self._current)
+            self._current = None
+
+
+def parse_somdn_form(html, page_url):
+    """Returns (method, action_url, fields) for the product's download form, or None if it has none."""
+    parser = _SomdnFormParser()
+    parser.feed(html)
+    parser.close()
+    for form in parser.forms:
+        if form["has_button"] and any(name.startswith("somdn") for name in form["fields"]):
+            return form["method"], urljoin(page_url, form["action"]), form["fields"]
+    return None
+
+
+# --- 4. DIRECT DOWNLOAD BACKEND ---
+
+def adopt_browser_session(driver, session):
+    """Copies cookies and the user agent from a live WebDriver so POSTs look like the browser's own."""
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+
+
+def download_product(session, product_url, dest_dir, timeout=(10, 30)):
+    """Reads the product page over HTTP, submits its somdn form and streams the archive to `dest_dir`."""
+    page = session.get(product_url, timeout=timeout)
+    page.raise_for_status()
+    form = parse_somdn_form(page.text, page.url)
+    if form is None:
+        raise ValueError(f"No somdn download form on {product_url}")
+    method, action_url, fields = form
+    if method == "GET":
+        action_url += ("&" if "?" in action_url else "?") + urlencode(fields)
+        fields = None
+    return stream_to_file(session, action_url, dest_dir, method=method, data=fields,
+                          headers={"Referer": page.url})
@@ -0,0 +1,412 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+# --- 1. LOCATION & SCHEMA ---
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# ASSET_CATALOG points every tool at another catalog file (benchmarks use a throwaway one).
+CATALOG_FILE = os.environ.get("ASSET_CATALOG") or os.path.join(REPO_ROOT, "asset_catalog.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    source      TEXT NOT NULL,
+    asset_id    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (source, asset_id)
+);
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    asset_id    TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    size        INTEGER,
+    sha256      TEXT,
+    status      TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_by_asset ON files (source, asset_id);
+CREATE TABLE IF NOT EXISTS extractions (
+    archive_path TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    dest_dir     TEXT NOT NULL,
+    members      TEXT,
+    complete     INTEGER NOT NULL,
+    updated_at   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archive_index (
+    archive_path TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    error        TEXT,
+    indexed_at   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archive_members (
+    archive_path TEXT NOT NULL,
+    name         TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    compressed   INTEGER NOT NULL,
+    crc          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive_members_by_archive ON archive_members (archive_path);
+CREATE TABLE IF NOT EXISTS verifications (
+    archive_path TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    ok           INTEGER NOT NULL,
+    error        TEXT,
+    verified_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path         TEXT NOT NULL,
+    target       TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    mtime_ns     INTEGER NOT NULL,
+    materials    TEXT NOT NULL,
+    imported_at  TEXT NOT NULL,
+    PRIMARY KEY (path, target)
+);
+CREATE TABLE IF NOT EXISTS previews (
+    output           TEXT PRIMARY KEY,
+    source           TEXT NOT NULL,
+    kind             TEXT NOT NULL,
+    source_size      INTEGER NOT NULL,
+    source_mtime_ns  INTEGER NOT NULL,
+    width            INTEGER NOT NULL,
+    height           INTEGER NOT NULL,
+    written          INTEGER NOT NULL,
+    created_at       TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS asset_aliases (
+    source      TEXT NOT NULL,
+    alias       TEXT NOT NULL,
+    asset_id    TEXT NOT NULL,
+    PRIMARY KEY (source, alias, asset_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+);
+"""
+
+AMBIENTCG = "ambientcg"
+C4DCENTER = "c4dcenter"
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _aliases(asset_id):
+    """Every run of whole '-' separated words: 'wood-planks-01-4k' -> 'wood', 'wood-planks', ..., '01-4k', '4k'."""
+    words = asset_id.split("-")
+    return {"-".join(words[i:j]) for i in range(len(words)) for j in range(i + 1, len(words) + 1)}
+
+
+# --- 2. CATALOG ---
+
+class AssetCatalog:
+    """SQLite index of every asset and file the scrapers, extractor and importer know about.
+
+    Lookups go through the (source, asset_id) primary key, so duplicate checks stay O(1) no matter
+    how many archives sit in the download folder. One connection is shared across threads behind a
+    lock; WAL mode lets a second process (e.g. the extractor) read while a scraper writes.
+    """
+
+    def __init__(self, path=CATALOG_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Assets ---
+
+    def has(self, source, asset_id):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM assets WHERE source = ? AND asset_id = ? AND status != 'failed'",
+                                     (source, asset_id)).fetchone()
+        return row is not None
+
+    def has_matching(self, source, fragment):
+        """Like `has`, but also true when `fragment` is a whole-word part of an archive name indexed by
+        `import_directory`, as the scrapers' old file-name check was (two primary-key lookups).
+
+        Product 'wood-planks-01' counts as present when 'Wood_Planks_01_4K.zip' is in the folder.
+        """
+        if self.has(source, fragment):
+            return True
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM asset_aliases AS a JOIN assets AS s ON s.source = a.source AND s.asset_id = a.asset_id "
+                "WHERE a.source = ? AND a.alias = ? AND s.status != 'failed' LIMIT 1", (source, fragment)).fetchone()
+        return row is not None
+
+    def status(self, source, asset_id):
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM assets WHERE source = ? AND asset_id = ?",
+                                     (source, asset_id)).fetchone()
+        return row[0] if row else None
+
+    def known_ids(self, source):
+        with self._lock:
+            rows = self._conn.execute("SELECT asset_id FROM assets WHERE source = ? AND status != 'failed'", (source,))
+            return {r[0] for r in rows}
+
+    def failed_ids(self, source):
+        with self._lock:
+            rows = self._conn.execute("SELECT asset_id FROM assets WHERE source = ? AND status = 'failed'", (source,))
+            return {r[0] for r in rows}
+
+    def mark(self, source, asset_id, status="downloaded"):
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO assets (source, asset_id, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, asset_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at",
+                (source, asset_id, status, now, now))
+
+    # --- Files ---
+
+    def add_file(self, source, asset_id, path, size=None, sha256=None, status="downloaded"):
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO files (path, source, asset_id, name, size, sha256, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (path) DO UPDATE SET "
+                "size = COALESCE(excluded.size, size), sha256 = COALESCE(excluded.sha256, sha256), "
+                "status = excluded.status, updated_at = excluded.updated_at",
+                (os.path.abspath(path), source, asset_id, os.path.basename(path), size, sha256, status, now))
+
+    def set_file_status(self, path, status, source="local"):
+        """Updates a file's status, registering it under `source` (keyed by its stem) if it is unknown."""
+        path = os.path.abspath(path)
+        with self._lock, self._conn:
+            updated = self._conn.execute("UPDATE files SET status = ?, updated_at = ? WHERE path = ?",
+                                         (status, _now(), path)).rowcount
+        if not updated:
+            self.add_file(source, os.path.splitext(os.path.basename(path))[0].lower(), path,
+                          size=os.path.getsize(path) if os.path.exists(path) else None, status=status)
+
+    def file_owner(self, path):
+        """(source, asset_id) the file was downloaded for, or None if the catalog has never seen it."""
+        with self._lock:
+            return self._conn.execute("SELECT source, asset_id FROM files WHERE path = ?",
+                                      (os.path.abspath(path),)).fetchone()
+
+    def files_for(self, source, asset_id):
+        with self._lock:
+            rows = self._conn.execute("SELECT path, size, sha256, status FROM files WHERE source = ? AND asset_id = ?",
+                                      (source, asset_id))
+            return rows.fetchall()
+
+    # --- Extraction manifest ---
+
+    def extraction_entries(self):
+        """{archive_path: {size, mtime_ns, dest_dir, members, complete}} for every archive ever extracted."""
+        with self._lock:
+            rows = self._conn.execute("SELECT archive_path, size, mtime_ns, dest_dir, members, complete FROM extractions")
+            return {r[0]: {"size": r[1], "mtime_ns": r[2], "dest_dir": r[3],
+                           "members": json.loads(r[4]) if r[4] else None, "complete": bool(r[5])} for r in rows}
+
+    def begin_extraction(self, archive_path, dest_dir):
+        """Flags an archive as in progress so an interrupted run is repaired rather than skipped next time."""
+        st = os.stat(archive_path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO extractions (archive_path, size, mtime_ns, dest_dir, members, complete, updated_at) "
+                "VALUES (?, ?, ?, ?, NULL, 0, ?) ON CONFLICT (archive_path) DO UPDATE SET complete = 0, "
+                "updated_at = excluded.updated_at",
+                (os.path.abspath(archive_path), st.st_size, st.st_mtime_ns, os.path.abspath(dest_dir), _now()))
+
+    def record_extraction(self, result):
+        """Stores an `extraction.extract_archive` result; only successful runs are marked complete."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO extractions (archive_path, size, mtime_ns, dest_dir, members, complete, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (archive_path) DO UPDATE SET size = excluded.size, "
+                "mtime_ns = excluded.mtime_ns, dest_dir = excluded.dest_dir, "
+                "members = COALESCE(excluded.members, members), complete = excluded.complete, "
+                "updated_at = excluded.updated_at",
+                (os.path.abspath(result["path"]), result["archive_size"], result["archive_mtime_ns"],
+                 os.path.abspath(result["dest_dir"]), json.dumps(result["listing"]) if result["listing"] else None,
+                 int(result["ok"]), _now()))
+
+    # --- Verification cache ---
+
+    def verification_entries(self):
+        """{archive_path: {size, mtime_ns, ok, error}} for every archive whose CRCs were checked."""
+        with self._lock:
+            rows = self._conn.execute("SELECT archive_path, size, mtime_ns, ok, error FROM verifications")
+            return {r[0]: {"size": r[1], "mtime_ns": r[2], "ok": bool(r[3]), "error": r[4]} for r in rows}
+
+    def record_verification(self, result):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verifications (archive_path, size, mtime_ns, ok, error, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(result["path"]), result["size"], result["mtime_ns"], int(result["ok"]),
+                 result["error"], _now()))
+
+    # --- Import manifest ---
+
+    def import_entries(self, target):
+        """{path: {size, mtime_ns, materials}} for every .c4d file imported into the `target` document."""
+        with self._lock:
+            rows = self._conn.execute("SELECT path, size, mtime_ns, materials FROM imports WHERE target = ?", (target,))
+            return {r[0]: {"size": r[1], "mtime_ns": r[2], "materials": json.loads(r[3])} for r in rows}
+
+    def record_import(self, path, target, size, mtime_ns, materials):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imports (path, target, size, mtime_ns, materials, imported_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(path), target, size, mtime_ns, json.dumps(materials), _now()))
+
+    def forget_imports(self, paths, target):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM imports WHERE path = ? AND target = ?", [(p, target) for p in paths])
+
+    # --- Preview index ---
+
+    def preview_entries(self):
+        """{output: {source, kind, source_size, source_mtime_ns, written}} for every generated preview."""
+        with self._lock:
+            rows = self._conn.execute("SELECT output, source, kind, source_size, source_mtime_ns, written FROM previews")
+            return {r[0]: {"source": r[1], "kind": r[2], "source_size": r[3], "source_mtime_ns": r[4],
+                           "written": bool(r[5])} for r in rows}
+
+    def record_previews(self, result):
+        """Stores the outputs of one `previews.render_previews` result."""
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO previews (output, source, kind, source_size, source_mtime_ns, width, height, "
+                "written, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(o["output"], result["source"], o["kind"], result["size"], result["mtime_ns"], o["width"], o["height"],
+                  int(o["written"]), now) for o in result["outputs"]])
+
+    # --- Archive content index ---
+
+    def archive_index_stamps(self):
+        """{archive_path: (size, mtime_ns)} for every indexed archive."""
+        with self._lock:
+            rows = self._conn.execute("SELECT archive_path, size, mtime_ns FROM archive_index")
+            return {r[0]: (r[1], r[2]) for r in rows}
+
+    def store_archive_index(self, entry):
+        """Replaces the member rows of one archive with an `archive_index.read_central_directory` result."""
+        path = os.path.abspath(entry["path"])
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM archive_members WHERE archive_path = ?", (path,))
+            self._conn.executemany("INSERT INTO archive_members (archive_path, name, size, compressed, crc) "
+                                   "VALUES (?, ?, ?, ?, ?)", [(path,) + tuple(m) for m in entry["members"]])
+            self._conn.execute("INSERT OR REPLACE INTO archive_index (archive_path, size, mtime_ns, error, indexed_at) "
+                               "VALUES (?, ?, ?, ?, ?)", (path, entry["size"], entry["mtime_ns"], entry["error"], _now()))
+
+    def find_members(self, terms=(), extensions=(), min_size=None, limit=200):
+        """Members whose name contains every term (case-insensitive), e.g. ("16K", "normal")."""
+        sql = ("SELECT archive_path, name, size, compressed, crc, "
+               "CASE WHEN size > 0 THEN CAST(compressed AS REAL) / size ELSE 1.0 END AS ratio "
+               "FROM archive_members WHERE 1 = 1")
+        params = []
+        for term in terms:
+            sql += " AND name LIKE ?"
+            params.append(f"%{term}%")
+        if extensions:
+            sql += " AND (" + " OR ".join("name LIKE ?" for _ in extensions) + ")"
+            params.extend(f"%{ext}" for ext in extensions)
+        if min_size is not None:
+            sql += " AND size >= ?"
+            params.append(min_size)
+        sql += " ORDER BY size DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def archive_summary(self):
+        """(archives, members, uncompressed bytes, compressed bytes, unreadable archives) across the index."""
+        with self._lock:
+            members = self._conn.execute("SELECT COUNT(DISTINCT archive_path), COUNT(*), COALESCE(SUM(size), 0), "
+                                         "COALESCE(SUM(compressed), 0) FROM archive_members").fetchone()
+            broken = self._conn.execute("SELECT COUNT(*) FROM archive_index WHERE error IS NOT NULL").fetchone()[0]
+        return members + (broken,)
+
+    # --- Bulk imports (rerun when the source changes) ---
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_history_file(self, source, history_file):
+        """Loads a one-id-per-line history file; skipped when the file is unchanged since the last import."""
+        if not os.path.exists(history_file):
+            return 0
+        st = os.stat(history_file)
+        key, stamp = f"history:{os.path.abspath(history_file)}", f"{st.st_size}:{st.st_mtime_ns}"
+        if self._meta(key) == stamp:
+            return 0
+        now = _now()
+        with open(history_file, "r") as f:
+            rows = [(source, line.strip(), "downloaded", now, now) for line in f if line.strip()]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO assets (source, asset_id, status, created_at, updated_at) "
+                                   "VALUES (?, ?, ?, ?, ?)", rows)
+        self._set_meta(key, stamp)
+        return len(rows)
+
+    def import_directory(self, source, directory, asset_id_for=None, extensions=(".zip",)):
+        """Registers new archives in `directory`, keyed by `asset_id_for(name)` (default: lowercase stem).
+
+        Skipped when the folder's mtime is unchanged since the last import, so archives copied in
+        by hand (or by another tool) between runs are picked up next time.
+        """
+        if not os.path.isdir(directory):
+            return 0
+        # The ":aliases" suffix makes catalogs indexed before the alias table existed rescan once
+        key, stamp = f"directory:{source}:{os.path.abspath(directory)}", f"{os.stat(directory).st_mtime_ns}:aliases"
+        if self._meta(key) == stamp:
+            return 0
+        asset_id_for = asset_id_for or (lambda name: os.path.splitext(name)[0].lower())
+        now = _now()
+        assets, files, aliases = [], [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(extensions):
+                    continue
+                asset_id = asset_id_for(entry.name)
+                assets.append((source, asset_id, "downloaded", now, now))
+                aliases.extend((source, alias, asset_id) for alias in _aliases(asset_id))
+                files.append((os.path.abspath(entry.path), source, asset_id, entry.name, entry.stat().st_size,
+                              "downloaded", now))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO assets (source, asset_id, status, created_at, updated_at) "
+                                   "VALUES (?, ?, ?, ?, ?)", assets)
+            self._conn.executemany("INSERT OR IGNORE INTO asset_aliases (source, alias, asset_id) VALUES (?, ?, ?)",
+                                   aliases)
+            added = self._conn.executemany("INSERT OR IGNORE INTO files (path, source, asset_id, name, size, status, "
+                                           "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)", files).rowcount
+        self._set_meta(key, stamp)
+        return added
@@ -0,0 +1,204 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+
+# --- 1. RESULT TYPE & CONSTANTS ---
+
+DownloadResult = namedtuple("DownloadResult", ["path", "size", "duration"])
+
+PARTIAL_SUFFIXES = (".crdownload", ".tmp", ".part")
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Returns libc with inotify bound, or None when the platform has no inotify."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1  # noqa: B018 - raises AttributeError when missing
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+# --- 2. TRACKER ---
+
+class _Expectation:
+    __slots__ = ("match", "key", "future", "started", "baseline")
+
+    def __init__(self, match, key):
+        self.key = key
+        self.match = key(match)
+        self.future = Future()
+        self.started = time.monotonic()
+        self.baseline = {}  # name -> (size, mtime_ns) of matching files that existed before the download
+
+    def matches(self, name):
+        return self.match in self.key(name)
+
+
+class CompletionTracker:
+    """Resolves one Future per expected browser download as soon as its final file appears.
+
+    On Linux the download directory is watched with inotify, so a finished file is reported by the
+    kernel rename/close event Chrome triggers when it drops the `.crdownload` suffix. Elsewhere
+    (Windows, macOS) a background thread stats the directory while a download is pending and only
+    lists it when its mtime changed (or every `rescan_interval` seconds as a safety net). Files that
+    already matched when `expect()` was called only count once their size or mtime changes, so an
+    old copy of the same archive never resolves a new download early.
+    Call `expect()` *before* triggering the download so fast transfers are not missed.
+    """
+
+    def __init__(self, directory, poll_interval=1.0, rescan_interval=15.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._libc = _load_inotify()
+        self._fd = None
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+            if fd >= 0 and self._libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) >= 0:
+                self._fd = fd
+            elif fd >= 0:
+                os.close(fd)
+        self.backend = "inotify" if self._fd is not None else "polling"
+        self._thread = threading.Thread(target=self._run, name="download-completion", daemon=True)
+        self._thread.start()
+
+    # --- Public API ---
+
+    def expect(self, match, key=str.lower):
+        """Registers a download whose final file name contains `match` once both go through `key`.
+
+        The default compares case-insensitively; pass e.g. `c4dcenter.slug_from_filename` when the
+        file name is a differently spelled form of `match` ("Wood_Planks_01.zip" vs "wood-planks-01").
+        """
+        expectation = _Expectation(match, key)
+        if self._fd is None:
+            expectation.baseline = {name: stamp for name, stamp in self._scan() if expectation.matches(name)}
+        with self._lock:
+            self._pending.append(expectation)
+        self._wakeup.set()
+        return expectation.future
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def wait_any(self, timeout=None):
+        """Blocks until one pending download resolves (or `timeout` passes)."""
+        with self._lock:
+            futures = [e.future for e in self._pending]
+        if futures:
+            wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def expire(self, max_age):
+        """Fails every download that has been pending longer than `max_age` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [e for e in self._pending if now - e.started > max_age]
+            self._pending = [e for e in self._pending if e not in stale]
+        for e in stale:
+            e.future.set_exception(TimeoutError(f"No finished file matching '{e.match}' after {max_age:.0f}s"))
+        return len(stale)
+
+    def close(self):
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout=2)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # --- Internals ---
+
+    def _scan(self):
+        """(name, (size, mtime_ns)) for every finished file in the directory."""
+        found = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(PARTIAL_SUFFIXES):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    found.append((entry.name, (st.st_size, st.st_mtime_ns)))
+        except OSError:
+            pass
+        return found
+
+    def _resolve(self, name, stamp=None):
+        """Resolves the first pending download `name` belongs to; `stamp` is given by the scanning backend."""
+        if name.endswith(PARTIAL_SUFFIXES):
+            return
+        with self._lock:
+            match = next((e for e in self._pending if e.matches(name)
+                          and (stamp is None or e.baseline.get(name) != stamp)), None)
+            if match is None:
+                return
+            self._pending.remove(match)
+        path = os.path.join(self.directory, name)
+        try:
+            size = os.path.getsize(path)
+        except OSError as err:
+            match.future.set_exception(err)
+            return
+        match.future.set_result(DownloadResult(path, size, time.monotonic() - match.started))
+
+    def _run(self):
+        if self._fd is not None:
+            self._run_inotify()
+        else:
+            self._run_polling()
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.5)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                if name:
+                    self._resolve(name)
+
+    def _run_polling(self):
+        last_mtime, last_scan = None, 0.0
+        while not self._stop.is_set():
+            if not self.pending():
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            try:
+                mtime = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            # Creating or renaming an entry (Chrome dropping ".crdownload") changes the directory mtime
+            if mtime != last_mtime or time.monotonic() - last_scan >= self.rescan_interval:
+                last_mtime, last_scan = mtime, time.monotonic()
+                for name, stamp in self._scan():
+                    self._resolve(name, stamp)
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# --- 1. CONFIGURATION ---
+
+STORE_DIR_NAME = ".texture_store"
+TEXTURE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".exr", ".tif", ".tiff", ".tga", ".hdr", ".bmp")
+HASH_CHUNK = 4 * 1024 * 1024
+FICLONE = 0x40049409  # Linux ioctl used by `cp --reflink`
+
+
+def hash_file(path):
+    """Worker entry point: (path, sha256 hex) or (path, None) when the file cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+    except OSError:
+        return path, None
+    return path, digest.hexdigest()
+
+
+def blob_path(store_dir, sha256):
+    return os.path.join(store_dir, sha256[:2], sha256)
+
+
+# --- 2. LINKING ---
+
+def _reflink(src, dst):
+    import fcntl
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    except BaseException:
+        if os.path.exists(dst):
+            os.remove(dst)  # Never leave an empty clone behind
+        raise
+
+
+def _check_reflink(store_dir):
+    """Clones a small probe file inside the store; raises ValueError when the filesystem cannot reflink."""
+    probe = os.path.join(store_dir, "reflink-probe.tmp")
+    try:
+        with open(probe, "wb") as f:
+            f.write(b"probe")
+        _reflink(probe, probe + ".clone")
+        os.remove(probe + ".clone")
+    except OSError as e:
+        raise ValueError(f"Reflink mode is not supported on this filesystem ({e.strerror}); "
+                         f"use Btrfs/XFS or set the mode to \"hardlink\"") from e
+    finally:
+        if os.path.exists(probe):
+            os.remove(probe)
+
+
+def _store_blob(path, blob, mode):
+    """Adds `path` to the store as `blob`, via a temp name so a failed link never leaves a bad blob."""
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    tmp = blob + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        if mode == "reflink":
+            _reflink(path, tmp)
+        else:
+            os.link(path, tmp)
+        os.replace(tmp, blob)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _replace_with_link(blob, path, mode):
+    """Points `path` at `blob` via a temp name + atomic rename, so a failure never loses the file."""
+    tmp = path + ".dedup-tmp"
+    if mode == "reflink":
+        _reflink(blob, tmp)
+    else:
+        os.link(blob, tmp)
+    os.replace(tmp, path)
+
+
+# --- 3. DEDUPLICATION PASS ---
+
+def deduplicate(root, workers=None, extensions=TEXTURE_EXTENSIONS, mode="hardlink", on_progress=None):
+    """Stores every duplicated texture under `root` once in `root/.texture_store` and links the copies to it.
+
+    Only files that share their size with another file are hashed, and the hashing runs across a
+    process pool. Files that are already hard links to a stored blob are recognised by inode and
+    skipped, so re-runs only hash new files. `mode="reflink"` makes copy-on-write clones instead
+    of hard links (Linux, Btrfs/XFS) so editing one material never changes another; clones are not
+    recognisable by inode, so reflink re-runs hash everything again. Reflink mode raises ValueError
+    before touching anything when the filesystem cannot clone. Returns a report dict.
+    """
+    if mode == "reflink" and not sys.platform.startswith("linux"):
+        raise ValueError("Reflink mode is only supported on Linux (Btrfs/XFS)")
+    store_dir = os.path.join(root, STORE_DIR_NAME)
+    os.makedirs(store_dir, exist_ok=True)
+    if mode == "reflink":
+        _check_reflink(store_dir)  # Before any blob is written
+
+    stored = {}
+    for dirpath, _, files in os.walk(store_dir):
+        for name in files:
+            if name.endswith(".tmp"):  # Left by an interrupted run, never a valid blob
+                os.remove(os.path.join(dirpath, name))
+                continue
+            st = os.stat(os.path.join(dirpath, name))
+            stored[(st.st_dev, st.st_ino)] = name
+
+    report = {"scanned": 0, "hashed": 0, "already_linked": 0, "linked": 0, "unique_blobs": 0, "bytes_saved": 0}
+    by_size = defaultdict(list)
+    for dirpath, dirnames, files in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != STORE_DIR_NAME]
+        for name in files:
+            if not name.lower().endswith(extensions):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            report["scanned"] += 1
+            if (st.st_dev, st.st_ino) in stored:
+                report["already_linked"] += 1
+                continue
+            by_size[st.st_size].append(path)
+
+    known_sizes = {os.path.getsize(os.path.join(store_dir, h[:2], h)) for h in stored.values()}
+    candidates = [p for size, paths in by_size.items() if len(paths) > 1 or size in known_sizes for p in paths]
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for path, sha256 in pool.map(hash_file, candidates, chunksize=16):
+            if sha256 is None:
+                continue
+            report["hashed"] += 1
+            blob = blob_path(store_dir, sha256)
+            size = os.path.getsize(path)
+            if not os.path.exists(blob) or os.path.getsize(blob) != size:
+                _store_blob(path, blob, mode)  # Also replaces a blob damaged by an older run
+                report["unique_blobs"] += 1
+                continue
+            if mode == "hardlink" and os.path.samefile(blob, path):
+                continue
+            _replace_with_link(blob, path, mode)
+            report["linked"] += 1
+            report["bytes_saved"] += size
+            if on_progress is not None:
+                on_progress(path, size)
+    return report
@@ -0,0 +1,169 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# --- 1. CONFIGURATION ---
+
+BUFFER_SIZE = 4 * 1024 * 1024
+SEVEN_ZIP_CANDIDATES = (r"C:\Program Files\7-Zip\7z.exe", r"C:\Program Files (x86)\7-Zip\7z.exe")
+
+
+def find_seven_zip():
+    """Returns a usable 7z executable (PATH first, then the default Windows installs) or None."""
+    found = shutil.which("7z") or shutil.which("7za")
+    if found:
+        return found
+    return next((p for p in SEVEN_ZIP_CANDIDATES if os.path.exists(p)), None)
+
+
+def safe_member_path(dest_dir, member_name):
+    """Maps a zip member to a path inside `dest_dir`; returns None for absolute or `..` entries."""
+    parts = [p for p in member_name.replace("\\", "/").split("/") if p not in ("", ".")]
+    if not parts or ".." in parts or ":" in parts[0]:
+        return None
+    return os.path.join(dest_dir, *parts)
+
+
+# --- 2. BACKENDS ---
+
+def archive_listing(archive):
+    """[[name, size, crc], ...] for every file member; stored in the manifest to detect changes."""
+    return [[i.filename, i.file_size, i.CRC] for i in archive.infolist() if not i.is_dir()]
+
+
+def _is_current(info, target, previous):
+    if info.filename in previous and previous[info.filename] != info.CRC:
+        return False
+    return os.path.exists(target) and os.path.getsize(target) == info.file_size
+
+
+def extract_zip(zip_path, dest_dir, members=None, buffer_size=BUFFER_SIZE, previous=None):
+    """Streams members of `zip_path` into `dest_dir` with large buffered copies.
+
+    With `previous` (member name -> CRC from the manifest), a member is left alone when its file is
+    already on disk at full size and its CRC has not changed since the manifest was written.
+    Returns (count, bytes, listing).
+    """
+    count = written = 0
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if members is not None and info.filename not in members:
+                continue
+            target = safe_member_path(dest_dir, info.filename)
+            if target is None:
+                continue
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            if previous is not None and _is_current(info, target, previous):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Write beside the target and rename, so a deduplicated (hard-linked) texture is
+            # replaced rather than overwritten through every material that shares it.
+            tmp = target + ".extract-tmp"
+            with archive.open(info) as src, open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, buffer_size)
+            stamp = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(tmp, (stamp, stamp))
+            os.replace(tmp, target)
+            count += 1
+            written += info.file_size
+        listing = archive_listing(archive)
+    return count, written, listing
+
+
+def extract_7z(zip_path, dest_dir, seven_zip):
+    """Runs `7z x` for one archive; returns (count, bytes, listing) read from the archive listing.
+
+    7-Zip writes into a scratch folder inside `dest_dir` and each file is then renamed into place,
+    so, as in `extract_zip`, a deduplicated (hard-linked) texture is replaced, never written through.
+    """
+    scratch = tempfile.mkdtemp(prefix=".7z-", dir=dest_dir)
+    try:
+        result = subprocess.run([seven_zip, "x", zip_path, f"-o{scratch}", "-y"], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"7z exited with {result.returncode}")
+        for dirpath, _, files in os.walk(scratch):
+            target_dir = os.path.join(dest_dir, os.path.relpath(dirpath, scratch))
+            os.makedirs(target_dir, exist_ok=True)
+            for name in files:
+                os.replace(os.path.join(dirpath, name), os.path.join(target_dir, name))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    with zipfile.ZipFile(zip_path) as archive:
+        listing = archive_listing(archive)
+    return len(listing), sum(size for _, size, _ in listing), listing
+
+
+# --- 3. INCREMENTAL PLANNING ---
+
+def plan_incremental(zip_paths, dest_dir, manifest):
+    """Splits archives into ({path: previous-or-None} to extract, [paths] to skip).
+
+    `manifest` is `AssetCatalog.extraction_entries()`. An archive whose size and mtime match a
+    complete entry for the same destination is skipped after one stat call. Anything else is
+    extracted: in full when it was never seen, or as a repair pass (only new, changed or missing
+    members) when an entry exists but the archive changed or the last run did not finish.
+    """
+    todo, skipped = {}, []
+    for path in zip_paths:
+        st = os.stat(path)
+        entry = manifest.get(os.path.abspath(path))
+        if entry is None or entry["dest_dir"] != os.path.abspath(dest_dir):
+            todo[path] = None
+        elif entry["complete"] and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            skipped.append(path)
+        else:
+            todo[path] = {name: crc for name, _, crc in entry["members"] or []}
+    return todo, skipped
+
+
+# --- 4. PROCESS POOL ---
+
+def extract_archive(zip_path, dest_dir, backend="zipfile", seven_zip=None, members=None, previous=None):
+    """Worker entry point: extracts one archive and reports a result dict instead of raising."""
+    start = time.perf_counter()
+    st = os.stat(zip_path)
+    listing = None
+    try:
+        if backend == "7z":
+            count, written, listing = extract_7z(zip_path, dest_dir, seven_zip)
+        else:
+            count, written, listing = extract_zip(zip_path, dest_dir, members, previous=previous)
+        error = None
+    except Exception as e:
+        count, written, error = 0, 0, f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+    return {"path": zip_path, "ok": error is None, "members": count, "bytes": written,
+            "seconds": seconds, "error": error, "listing": listing, "dest_dir": dest_dir,
+            "archive_size": st.st_size, "archive_mtime_ns": st.st_mtime_ns}
+
+
+def extract_all(zip_paths, dest_dir, workers=None, backend="zipfile", seven_zip=None, on_result=None, previous=None):
+    """Extracts `zip_paths` across a process pool sized to the CPU count; returns the result dicts.
+
+    `previous` maps an archive path to its manifest member CRCs to run a repair pass (see
+    `plan_incremental`); archives without an entry are extracted in full.
+    """
+    workers = workers or os.cpu_count() or 1
+    previous = previous or {}
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(extract_archive, p, dest_dir, backend, seven_zip, None, previous.get(p))
+                   for p in zip_paths]
+        for fut in as_completed(futures):
+            result = fut.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+def describe(result):
+    mb = result["bytes"] / 1048576
+    rate = mb / result["seconds"] if result["seconds"] > 0 else 0.0
+    return f"{result['members']} file(s), {mb:.1f} MB in {result['seconds']:.2f}s ({rate:.1f} MB/s)"
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs, unquote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from asset_tools.rate_limit import parse_retry_after
+
+# --- 1. SESSION SETUP ---
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = (10, 60)
+SEGMENT_THRESHOLD = 256 * 1024 * 1024
+PROGRESS_SAVE_BYTES = 16 * 1024 * 1024
+RETRYABLE = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+THROTTLE_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 600  # Longest Retry-After (seconds) a transfer retry will wait
+
+
+def make_session(pool_size=8, retries=2, respect_retry_after=True):
+    """Returns a keep-alive session whose connection pool fits `pool_size` parallel transfers.
+
+    With `respect_retry_after=False`, 429/503 responses are not retried inside urllib3 but reach
+    the caller (see `download_resumable(on_throttle=...)`), so a rate limiter can hear about them.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    retry = Retry(total=retries, backoff_factor=1.0, status_forcelist=(500, 502, 504),
+                  allowed_methods=("GET", "HEAD"), respect_retry_after_header=respect_retry_after)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# --- 2. STREAMING DOWNLOADS ---
+
+def filename_from_response(response, url):
+    """Picks the server's Content-Disposition name, then a `file=` query value, then the URL path."""
+    disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', disposition)
+    if match:
+        return os.path.basename(unquote(match.group(1)))
+    parsed = urlparse(url)
+    query_file = parse_qs(parsed.query).get("file")
+    if query_file:
+        return os.path.basename(query_file[0])
+    return os.path.basename(parsed.path) or "download.bin"
+
+
+def stream_to_file(session, url, dest_dir, filename=None, chunk_size=CHUNK_SIZE, timeout=TIMEOUT,
+                   method="GET", data=None, headers=None):
+    """Streams `url` into `dest_dir` via a `.part` file and returns (final_path, bytes_written)."""
+    with session.request(method, url, data=data, headers=headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        _reject_html(response, url)
+        name = filename or filename_from_response(response, url)
+        final_path = os.path.join(dest_dir, name)
+        part_path = final_path + ".part"
+        written = 0
+        with open(part_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+    expected = response.headers.get("Content-Length")
+    encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+    if expected is not None and not encoded and int(expected) != written:
+        raise IOError(f"Truncated transfer for {name}: {written} of {expected} bytes")
+    os.replace(part_path, final_path)
+    return final_path, written
+
+
+def _reject_html(response, url):
+    """A 200 HTML page (login wall, throttle notice) where a file was expected must not be saved as one."""
+    if response.headers.get("Content-Type", "").startswith("text/html"):
+        raise IOError(f"Expected a file from {url} but the server answered with an HTML page")
+
+
+# --- 3. RESUMABLE / SEGMENTED DOWNLOADS ---
+
+class IntegrityError(IOError):
+    """The finished file does not match the expected length or SHA-256."""
+
+
+def sha256_of(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _probe(session, url, timeout):
+    """One-byte range request: returns (total_size or None, supports_ranges, file_name)."""
+    headers = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        _reject_html(response, url)
+        name = filename_from_response(response, url)
+        if response.status_code == 206:
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            return (int(total) if total.isdigit() else None), True, name
+        length = response.headers.get("Content-Length")
+        return (int(length) if length else None), False, name
+
+
+def _fetch_single(session, url, part_path, total, ranges, chunk_size, timeout):
+    have = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if not ranges or (total is not None and have > total):
+        have = 0
+    if total is not None and have == total:
+        return
+    headers = {"Accept-Encoding": "identity"}
+    if have:
+        headers["Range"] = f"bytes={have}-"
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        _reject_html(response, url)
+        if have and response.status_code != 206:
+            have = 0  # Server ignored the range; start over
+        with open(part_path, "ab" if have else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+
+
+def _fetch_segmented(session, url, part_path, total, segments, chunk_size, timeout):
+    """Fills `part_path` with `segments` parallel byte ranges; progress survives restarts via a sidecar."""
+    state_path = part_path + ".json"
+    state = None
+    if os.path.exists(state_path) and os.path.exists(part_path):
+        with open(state_path, "r") as f:
+            state = json.load(f)
+        if state.get("total") != total:
+            state = None
+    if state is None:
+        step = -(-total // segments)
+        state = {"total": total, "segments": [[start, min(start + step, total) - 1, 0]
+                                              for start in range(0, total, step)]}
+        with open(part_path, "wb") as f:
+            f.truncate(total)
+    lock = threading.Lock()
+    unsaved = [0]
+
+    def save_state():
+        tmp = state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, state_path)
+
+    def fetch_segment(segment):
+        start, end, done = segment
+        if start + done > end:
+            return
+        headers = {"Range": f"bytes={start + done}-{end}", "Accept-Encoding": "identity"}
+        with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            _reject_html(response, url)
+            if response.status_code != 206:
+                raise IOError("Server ignored the byte range for a segmented download")
+            with open(part_path, "r+b") as f:
+                f.seek(start + done)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    f.flush()
+                    with lock:
+                        segment[2] += len(chunk)
+                        unsaved[0] += len(chunk)
+                        if unsaved[0] >= PROGRESS_SAVE_BYTES:
+                            save_state()
+                            unsaved[0] = 0
+
+    save_state()
+    try:
+        with ThreadPoolExecutor(max_workers=len(state["segments"])) as pool:
+            for fut in [pool.submit(fetch_segment, seg) for seg in state["segments"]]:
+                fut.result()
+    finally:
+        with lock:
+            save_state()
+    if any(start + done <= end for start, end, done in state["segments"]):
+        raise IOError("Segmented download ended with missing byte ranges")
+    os.remove(state_path)
+
+
+def _remove_part(part_path):
+    for path in (part_path, part_path + ".json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def download_resumable(session, url, dest_dir, filename=None, expected_size=None, sha256=None, segments=1,
+                       segment_threshold=SEGMENT_THRESHOLD, attempts=4, chunk_size=CHUNK_SIZE, timeout=TIMEOUT,
+                       on_throttle=None):
+    """Downloads `url` into `dest_dir`, resuming any earlier `.part` file, and returns (final_path, size).
+
+    Interrupted transfers continue with an HTTP Range request instead of starting from zero.
+    Files of at least `segment_threshold` bytes are split into `segments` parallel ranges when
+    the server supports them. The result must match the server's length, `expected_size` and
+    `sha256` (each when known) before it is atomically renamed into place. A mismatch raises
+    IntegrityError and deletes the part file. An HTML page instead of the file is retried, never saved.
+    A 429/503 is retried after the server's Retry-After (or the usual backoff) and first passed to
+    `on_throttle(error)`, e.g. so a shared rate limiter can slow every other request down too.
+    """
+    last_error = None
+    for attempt in range(attempts):
+        try:
+            total, ranges, name = _probe(session, url, timeout)
+            final_path = os.path.join(dest_dir, filename or name)
+            part_path = final_path + ".part"
+            if expected_size is not None and total is not None and expected_size != total:
+                _remove_part(part_path)
+                raise IntegrityError(f"{name}: server reports {total} bytes, expected {expected_size}")
+            if total is not None and os.path.exists(final_path) and os.path.getsize(final_path) == total:
+                return final_path, total
+
+            segmented = segments > 1 and ranges and total and total >= segment_threshold and \
+                (not os.path.exists(part_path) or os.path.exists(part_path + ".json"))
+            if segmented:
+                _fetch_segmented(session, url, part_path, total, segments, chunk_size, timeout)
+            else:
+                _fetch_single(session, url, part_path, total, ranges, chunk_size, timeout)
+
+            size = os.path.getsize(part_path)
+            expected = total if total is not None else expected_size
+            if expected is not None and size != expected:
+                raise IOError(f"{name}: transfer stopped at {size} of {expected} bytes")
+            if sha256 and sha256_of(part_path).lower() != sha256.lower():
+                os.remove(part_path)
+                raise IntegrityError(f"{name}: SHA-256 mismatch")
+            os.replace(part_path, final_path)
+            return final_path, size
+        except IntegrityError:
+            raise
+        except requests.HTTPError as err:
+            status = err.response.status_code if err.response is not None else None
+            if status is not None and 400 <= status < 500 and status != 429:
+                raise
+            last_error = err
+            delay = None
+            if status in THROTTLE_STATUSES:
+                if on_throttle is not None:
+                    on_throttle(err)
+                delay = parse_retry_after(err.response.headers.get("Retry-After"))
+            time.sleep(min(MAX_RETRY_AFTER, delay) if delay is not None else min(30, 2 ** attempt))
+        except RETRYABLE + (IOError,) as err:
+            last_error = err
+            time.sleep(min(30, 2 ** attempt))
+    raise last_error
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+from collections import deque
+
+# --- 1. DURABLE QUEUE ---
+
+class JournalQueue:
+    """FIFO of asset ids persisted as a JSON snapshot plus an append-only journal.
+
+    Every change appends one `{"op": ..., "id": ...}` line (enqueue / claim / done / failed) instead
+    of rewriting the whole list, so a run costs O(n) queue I/O. Every `compact_every` records the
+    state is written to a temp file and atomically renamed over the snapshot, and the journal is
+    reset. On load, ids that were claimed but never finished go back to the front of the queue, so
+    a crash or emergency stop resumes with the assets that were in progress. The snapshot keeps
+    the old `{"pending": [...]}` layout, so existing queue files load unchanged.
+    """
+
+    def __init__(self, snapshot_path, compact_every=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.compact_every = compact_every
+        self._pending = deque()
+        self._members = set()
+        self._claimed = {}
+        self._records = 0
+        self._lock = threading.Lock()
+        self._load()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    # --- Loading ---
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                for asset_id in json.load(f).get("pending", []):
+                    self._add(asset_id)
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from a crash mid-write
+                    self._apply(record["op"], record["id"])
+                    self._records += 1
+        # Claimed-but-unfinished work resumes first.
+        for asset_id in reversed(list(self._claimed)):
+            self._pending.appendleft(asset_id)
+            self._members.add(asset_id)
+        self._claimed.clear()
+
+    def _add(self, asset_id):
+        if asset_id not in self._members and asset_id not in self._claimed:
+            self._pending.append(asset_id)
+            self._members.add(asset_id)
+
+    def _apply(self, op, asset_id):
+        if op == "enqueue":
+            self._add(asset_id)
+        elif op == "claim":
+            if asset_id in self._members:
+                self._members.discard(asset_id)
+                if self._pending and self._pending[0] == asset_id:
+                    self._pending.popleft()
+                else:
+                    self._pending.remove(asset_id)
+            self._claimed[asset_id] = True
+        elif op in ("done", "failed"):
+            self._claimed.pop(asset_id, None)
+            if asset_id in self._members:
+                self._members.discard(asset_id)
+                self._pending.remove(asset_id)
+
+    # --- Journal ---
+
+    def _log(self, op, asset_id):
+        self._journal.write(json.dumps({"op": op, "id": asset_id}) + "\n")
+        self._journal.flush()
+        self._records += 1
+        if self._records >= self.compact_every:
+            self._compact()
+
+    def _compact(self):
+        state = list(self._claimed) + list(self._pending)
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pending": state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._records = 0
+
+    # --- Public API ---
+
+    def enqueue(self, asset_ids):
+        with self._lock:
+            for asset_id in asset_ids:
+                if asset_id not in self._members and asset_id not in self._claimed:
+                    self._add(asset_id)
+                    self._log("enqueue", asset_id)
+
+    def claim(self):
+        """Pops the next id (None when empty); it stays recoverable until done() or failed()."""
+        with self._lock:
+            if not self._pending:
+                return None
+            asset_id = self._pending.popleft()
+            self._members.discard(asset_id)
+            self._claimed[asset_id] = True
+            self._log("claim", asset_id)
+            return asset_id
+
+    def done(self, asset_id):
+        with self._lock:
+            self._claimed.pop(asset_id, None)
+            self._log("done", asset_id)
+
+    def failed(self, asset_id):
+        with self._lock:
+            self._claimed.pop(asset_id, None)
+            self._log("failed", asset_id)
+
+    def ids(self):
+        """Every id still owed work: claimed first, then pending."""
+        with self._lock:
+            return set(self._claimed) | self._members
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __bool__(self):
+        return bool(self._pending)
+
+    def close(self):
+        with self._lock:
+            self._compact()
+            self._journal.close()
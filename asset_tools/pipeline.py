@@ -0,0 +1,122 @@
+import functools
+import os
+import queue
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_tools.extraction import extract_archive
+
+# --- 1. VERIFY STAGE ---
+
+def quick_verify(zip_path):
+    """Cheap structural check before extraction: the central directory must parse and fit the file.
+
+    A truncated or half-written archive fails here in milliseconds. Member CRCs are still checked
+    during extraction, because zipfile validates them while streaming each member.
+    """
+    size = os.path.getsize(zip_path)
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            if info.header_offset + info.compress_size > size:
+                raise zipfile.BadZipFile(f"{info.filename} extends past the end of the file")
+    return True
+
+
+# --- 2. PIPELINE ---
+
+_STOP = object()
+PUT_TIMEOUT = 1.0  # Seconds between checks that the verify thread is still draining the queue
+
+
+class ExtractionPipeline:
+    """Runs finished downloads through verify -> extract while the scraper keeps downloading.
+
+    `submit()` places an archive on a bounded queue and blocks once `max_queued` archives are
+    waiting, which pushes back on the downloader instead of letting work pile up. A single verify
+    thread hands archives that pass to a process pool, which never holds more than `workers * 2`
+    extractions at once, so disk writes stay bounded too. `on_result` receives the same dict as
+    `extraction.extract_archive`, with `stage` set to "verify" or "extract". If the verify thread
+    dies, its exception is kept in `error` and re-raised by the next `submit()`.
+    """
+
+    def __init__(self, dest_dir, workers=None, max_queued=16, on_result=None):
+        self.dest_dir = dest_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.on_result = on_result
+        self.results = []
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._slots = threading.Semaphore(self.workers * 2)
+        self._lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._thread = threading.Thread(target=self._verify_loop, name="pipeline-verify", daemon=True)
+        self._thread.start()
+
+    def submit(self, zip_path):
+        if zip_path.lower().endswith(".zip"):
+            self._put(zip_path)
+
+    def _put(self, item):
+        """Blocks while the queue is full, but raises instead of waiting forever once the verify thread is gone."""
+        while True:
+            if self.error is not None:
+                raise RuntimeError(f"Extraction pipeline stopped: {self.error}") from self.error
+            try:
+                self._queue.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                if not self._thread.is_alive() and self.error is None:
+                    raise RuntimeError("Extraction pipeline stopped: the verify thread exited")
+
+    def _report(self, result):
+        with self._lock:
+            self.results.append(result)
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def _verify_loop(self):
+        try:
+            self._drain()
+        except BaseException as e:
+            self.error = e
+
+    def _drain(self):
+        while True:
+            zip_path = self._queue.get()
+            if zip_path is _STOP:
+                return
+            try:
+                quick_verify(zip_path)
+            except Exception as e:
+                self._report({"path": zip_path, "ok": False, "members": 0, "bytes": 0, "seconds": 0.0,
+                              "error": f"{type(e).__name__}: {e}", "stage": "verify"})
+                continue
+            self._slots.acquire()
+            future = self._pool.submit(extract_archive, zip_path, self.dest_dir)
+            future.add_done_callback(functools.partial(self._extracted, zip_path))
+
+    def _extracted(self, zip_path, future):
+        self._slots.release()
+        try:
+            result = future.result()
+        except Exception as e:
+            result = {"path": zip_path, "ok": False, "members": 0, "bytes": 0, "seconds": 0.0,
+                      "error": f"{type(e).__name__}: {e}"}
+        result["stage"] = "extract"
+        self._report(result)
+
+    def close(self):
+        """Drains everything still queued, waits for running extractions, and returns all results.
+
+        Never raises, so it is safe in a `finally`; a verify-thread failure is left in `error`.
+        """
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=PUT_TIMEOUT)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+        return self.results
@@ -0,0 +1,167 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for previews; everything else runs without it
+    Image = None
+else:
+    Image.MAX_IMAGE_PIXELS = None  # Local 16K textures are not decompression bombs
+
+# --- 1. CONFIGURATION ---
+
+PREVIEW_DIR_NAME = ".previews"
+# Formats Pillow decodes; .exr/.hdr sources are left out.
+PREVIEW_SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp")
+# The thumbnail of a material comes from its first texture whose name contains one of these.
+COLOR_HINTS = ("color", "albedo", "basecolor", "diffuse", "diff")
+THUMB_QUALITY = 85
+PROXY_JPEG_QUALITY = 92
+
+
+def require_pillow():
+    if Image is None:
+        raise RuntimeError("Preview generation needs Pillow. Install it with: pip install Pillow")
+
+
+def thumb_path(root, material_dir, size):
+    rel = os.path.relpath(material_dir, root)
+    return os.path.join(root, PREVIEW_DIR_NAME, f"thumbs_{size}px", rel + ".jpg")
+
+
+def proxy_path(root, texture, size):
+    """Proxies keep the texture's relative path and name, so a material can be pointed at the proxy folder."""
+    return os.path.join(root, PREVIEW_DIR_NAME, f"{size}px", os.path.relpath(texture, root))
+
+
+# --- 2. PLAN ---
+
+def _material_textures(root):
+    """{material folder: [texture entries]} for every folder under `root` holding decodable textures."""
+    found = {}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        textures = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith("."):  # .previews, .texture_store
+                    stack.append(entry.path)
+            elif entry.name.lower().endswith(PREVIEW_SOURCE_EXTENSIONS):
+                textures.append(entry)
+        if textures:
+            found[folder] = sorted(textures, key=lambda e: e.name.lower())
+    return found
+
+
+def _thumb_source(textures):
+    for entry in textures:
+        if any(hint in entry.name.lower() for hint in COLOR_HINTS):
+            return entry
+    return textures[0]
+
+
+def _up_to_date(entry, st, output):
+    if entry is None or entry["source_size"] != st.st_size or entry["source_mtime_ns"] != st.st_mtime_ns:
+        return False
+    return not entry["written"] or os.path.exists(output)
+
+
+def plan_previews(root, entries, thumb_size=256, proxy_size=1024):
+    """Splits the preview work under `root` against the index `entries` ({output: entry}).
+
+    Every material folder gets one thumbnail (from its color map) and, when `proxy_size` is set,
+    every texture gets a proxy no larger than `proxy_size` on its long edge. An output is up to date
+    when its source still has the size and mtime recorded when it was made. Returns (jobs, up_to_date);
+    each job decodes one source once and writes all of its outputs.
+    """
+    root = os.path.abspath(root)
+    jobs, up_to_date = [], 0
+    for folder, textures in _material_textures(root).items():
+        thumb = _thumb_source(textures)
+        for entry in textures:
+            st = entry.stat()
+            outputs = []
+            if proxy_size:
+                outputs.append(("proxy", proxy_path(root, entry.path, proxy_size), proxy_size))
+            if entry is thumb:
+                outputs.append(("thumb", thumb_path(root, folder, thumb_size), thumb_size))
+            todo = [o for o in outputs if not _up_to_date(entries.get(o[1]), st, o[1])]
+            up_to_date += len(outputs) - len(todo)
+            if todo:
+                jobs.append({"source": entry.path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "outputs": todo})
+    return jobs, up_to_date
+
+
+# --- 3. RENDERING (worker processes) ---
+
+def _to_jpeg_mode(img):
+    if img.mode in ("RGB", "L"):
+        return img
+    if img.mode.startswith("I"):  # 16-bit grayscale (height/roughness maps)
+        return img.convert("I").point(lambda v: v * (1 / 256)).convert("L")
+    return img.convert("RGB")
+
+
+def _save(img, output, kind):
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    tmp = output + ".tmp"
+    ext = os.path.splitext(output)[1].lower()
+    if kind == "thumb" or ext in (".jpg", ".jpeg"):
+        _to_jpeg_mode(img).save(tmp, "JPEG", quality=THUMB_QUALITY if kind == "thumb" else PROXY_JPEG_QUALITY,
+                                optimize=True)
+    else:
+        img.save(tmp, Image.registered_extensions()[ext])
+    os.replace(tmp, output)
+
+
+def render_previews(job):
+    """Worker entry point: decodes one texture and writes its outputs, largest first.
+
+    Each smaller output is reduced from the previous one rather than from the full image, and
+    outputs that would not be smaller than the source are recorded without writing a file.
+    """
+    start = time.perf_counter()
+    result = {"source": job["source"], "size": job["size"], "mtime_ns": job["mtime_ns"], "outputs": [], "error": None}
+    try:
+        with Image.open(job["source"]) as img:
+            largest = max(edge for _, _, edge in job["outputs"])
+            img.draft(img.mode, (largest, largest))  # JPEG sources decode straight at a reduced scale
+            img.load()
+            current = img
+            for kind, output, edge in sorted(job["outputs"], key=lambda o: -o[2]):
+                if max(current.size) > edge:
+                    current = current.copy()
+                    current.thumbnail((edge, edge), Image.LANCZOS, reducing_gap=2.0)
+                elif kind == "proxy":
+                    result["outputs"].append({"kind": kind, "output": output, "width": 0, "height": 0, "written": False})
+                    continue
+                _save(current, output, kind)
+                result["outputs"].append({"kind": kind, "output": output, "width": current.size[0],
+                                          "height": current.size[1], "written": True})
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def generate_all(jobs, workers=None, on_result=None):
+    """Renders `jobs` across a process pool, biggest sources first so large PNGs do not trail at the end.
+
+    Decoding a 16K texture holds about 1 GB per worker, so lower `workers` on machines short of RAM.
+    """
+    require_pillow()
+    results = []
+    ordered = sorted(jobs, key=lambda j: -j["size"])
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for future in as_completed([pool.submit(render_previews, job) for job in ordered]):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
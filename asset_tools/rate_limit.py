@@ -0,0 +1,208 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# --- 1. FIXED-INTERVAL LIMITER ---
+
+class RateLimiter:
+    """Spaces `wait()` calls from any number of threads at least `min_interval` (+ random jitter) apart."""
+
+    def __init__(self, min_interval, jitter=(0.0, 0.0)):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.min_interval + random.uniform(*self.jitter)
+        if start > now:
+            time.sleep(start - now)
+
+    @contextmanager
+    def request(self):
+        """Same interface as `AdaptiveRateLimiter.request`; outcomes are ignored."""
+        start = time.monotonic()
+        self.wait()
+        yield {"waited": time.monotonic() - start}
+
+
+# --- 2. ADAPTIVE LIMITER ---
+
+BACKOFF_STATUSES = (429, 502, 503, 504)
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_overload_error(error):
+    """Timeouts and dropped connections count as the server being overloaded (selenium and requests alike)."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return any("Timeout" in cls.__name__ or cls.__name__ == "ConnectionError" for cls in type(error).__mro__)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket plus concurrency cap that adapt to how the server is responding (AIMD).
+
+    Every healthy response adds `increase` requests/s to the rate (up to `max_rate`) and every
+    `concurrency` healthy responses allow one more request in flight (up to `max_concurrency`).
+    A 429/502/503/504, a timeout or responses far slower than the best seen so far multiply
+    both by `decrease` (at most once per `cooldown` seconds, so one burst of failures counts once),
+    and a Retry-After header pauses every caller until it has passed. `jitter` is added to the
+    spacing of every request however high the rate climbs, so traffic never turns machine-regular.
+    """
+
+    def __init__(self, rate=1.0, min_rate=0.1, max_rate=4.0, concurrency=1, max_concurrency=None, jitter=(0.0, 0.0),
+                 increase=0.05, decrease=0.5, slow_factor=4.0, slow_seconds=2.0, cooldown=5.0, max_retry_after=600.0, on_change=None):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency or concurrency
+        self.jitter = jitter
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.slow_seconds = slow_seconds
+        self.cooldown = cooldown
+        self.max_retry_after = max_retry_after
+        self.on_change = on_change
+        self._next = 0.0
+        self._paused_until = 0.0
+        self._last_backoff = -cooldown
+        self._latency = None
+        self._baseline = None
+        self._healthy_run = 0
+        self._active = 0
+        self._cond = threading.Condition()
+
+    # --- Pacing ---
+
+    def reserve(self):
+        """Takes the next request slot in the bucket and returns how many seconds to wait for it.
+
+        Non-blocking, so async code can `await asyncio.sleep(limiter.reserve())`.
+        """
+        with self._cond:
+            now = time.monotonic()
+            start = max(now, self._next, self._paused_until)
+            self._next = start + 1.0 / self.rate + random.uniform(*self.jitter)
+            return start - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    @contextmanager
+    def request(self):
+        """Holds a concurrency slot and a bucket token around one request, then records its outcome.
+
+        Yields a dict: set "status" (and "retry_after") from the response. Exceptions raised in the
+        block are recorded too (an `HTTPError` carries its response). Set "seconds" to None when the
+        block includes a file transfer, whose duration says nothing about server load.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+        outcome = {}
+        try:
+            self.wait()
+            outcome["waited"] = time.monotonic() - start
+            began = time.monotonic()
+            try:
+                yield outcome
+            except Exception as e:
+                self.record(error=e)
+                raise
+            seconds = outcome["seconds"] if "seconds" in outcome else time.monotonic() - began
+            self.record(status=outcome.get("status"), seconds=seconds, retry_after=outcome.get("retry_after"))
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify()
+
+    # --- Feedback ---
+
+    def record(self, status=None, seconds=None, error=None, retry_after=None):
+        """Feeds one response (or failure) back into the rate; callable from any thread."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            status = getattr(response, "status_code", status)
+            retry_after = retry_after or parse_retry_after(response.headers.get("Retry-After"))
+        with self._cond:
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + min(retry_after, self.max_retry_after))
+            if status in BACKOFF_STATUSES or (error is not None and _is_overload_error(error)):
+                reason = f"HTTP {status}" if status in BACKOFF_STATUSES else type(error).__name__
+                self._back_off(now, reason)
+            elif error is not None or (status is not None and status >= 400):
+                return  # Not a load signal (404, parse errors, ...)
+            elif seconds is not None and self._is_slow(seconds):
+                self._back_off(now, f"slow responses ({self._latency:.1f}s average)")
+            else:
+                self._speed_up()
+
+    def _is_slow(self, seconds):
+        """Tracks a moving average of latency; True when it is `slow_factor` times the best average seen
+        and above `slow_seconds` (so fast pages never trigger a back-off on relative noise)."""
+        self._latency = seconds if self._latency is None else self._latency * 0.8 + seconds * 0.2
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        if self._latency <= max(self._baseline * self.slow_factor, self.slow_seconds):
+            return False
+        self._baseline = self._baseline * 0.9 + self._latency * 0.1  # Follow a lasting change in page weight
+        return True
+
+    def _back_off(self, now, reason):
+        self._healthy_run = 0
+        if now - self._last_backoff < self.cooldown:
+            return
+        self._last_backoff = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.concurrency = max(1, int(self.concurrency * self.decrease))
+        self._next = max(self._next, now + 1.0 / self.rate)
+        self._changed(f"backing off after {reason}")
+
+    def _speed_up(self):
+        rate, concurrency = self.rate, self.concurrency
+        self.rate = min(self.max_rate, self.rate + self.increase)
+        self._healthy_run += 1
+        if self._healthy_run >= self.concurrency and self.concurrency < self.max_concurrency:
+            self._healthy_run = 0
+            self.concurrency += 1
+            self._cond.notify()
+        if int(rate * 2) != int(self.rate * 2) or concurrency != self.concurrency:
+            self._changed("speeding up")
+
+    def _changed(self, reason):
+        if self.on_change is not None:
+            self.on_change(f"{reason}: {self.describe()}")
+
+    def describe(self):
+        paused = self._paused_until - time.monotonic()
+        text = f"{self.rate:.2f} req/s, {self.concurrency} in flight"
+        return text + (f", paused {paused:.0f}s (Retry-After)" if paused > 0 else "")
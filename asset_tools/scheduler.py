@@ -0,0 +1,96 @@
+import asyncio
+import functools
+from collections import defaultdict, deque
+from urllib.parse import urlparse
+
+# --- 1. DEFAULTS ---
+
+MB = 1024 * 1024
+GB = 1024 * MB
+UNKNOWN_SIZE = 256 * MB  # Budget charged for a transfer whose label carried no size
+MAX_BYPASS = 16          # How many smaller jobs may overtake a large one before it gets priority
+
+
+class _Ticket:
+    __slots__ = ("host", "size", "bypassed")
+
+    def __init__(self, host, size):
+        self.host = host
+        self.size = size
+        self.bypassed = 0
+
+
+# --- 2. SCHEDULER ---
+
+class DownloadScheduler:
+    """Admits transfers against a per-host connection cap, a total cap and a bytes-in-flight budget.
+
+    Waiting jobs are woken when a running transfer finishes, never by polling. Smaller jobs may
+    start ahead of a queued large one while they fit the remaining budget, but only MAX_BYPASS
+    times; after that the large job is next. A job bigger than the whole budget runs alone.
+    """
+
+    def __init__(self, max_bytes_in_flight=4 * GB, max_per_host=4, max_total=8, max_waiting=None, executor=None):
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.max_per_host = max_per_host
+        self.max_total = max_total
+        self.max_waiting = max_waiting or max_total
+        self.executor = executor
+        self.bytes_in_flight = 0
+        self.active = 0
+        self.active_per_host = defaultdict(int)
+        self._waiting = deque()
+        self._cond = None
+
+    @property
+    def cond(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _can_start(self, ticket):
+        if self.active >= self.max_total or self.active_per_host[ticket.host] >= self.max_per_host:
+            return False
+        head = self._waiting[0]
+        if head is not ticket and head.bypassed >= MAX_BYPASS:
+            return False
+        return self.bytes_in_flight == 0 or self.bytes_in_flight + ticket.size <= self.max_bytes_in_flight
+
+    async def run(self, url, size, fn, *args, **kwargs):
+        """Waits for capacity for `url` (`size` bytes, None if unknown), then runs fn(*args, **kwargs) in the executor."""
+        ticket = _Ticket(urlparse(url).netloc, size or UNKNOWN_SIZE)
+        async with self.cond:
+            self._waiting.append(ticket)
+            self.cond.notify_all()
+            try:
+                await self.cond.wait_for(lambda: self._can_start(ticket))
+            except BaseException:
+                # Cancelled while queued: a stale ticket would keep blocking (and counting against) the queue
+                self._waiting.remove(ticket)
+                self.cond.notify_all()
+                raise
+            if self._waiting[0] is not ticket:
+                self._waiting[0].bypassed += 1
+            self._waiting.remove(ticket)
+            self.bytes_in_flight += ticket.size
+            self.active += 1
+            self.active_per_host[ticket.host] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            async with self.cond:
+                self.bytes_in_flight -= ticket.size
+                self.active -= 1
+                self.active_per_host[ticket.host] -= 1
+                self.cond.notify_all()
+
+    async def wait_for_room(self):
+        """Blocks a producer while `max_waiting` jobs are already queued for admission."""
+        async with self.cond:
+            await self.cond.wait_for(lambda: len(self._waiting) < self.max_waiting)
+
+    def describe(self):
+        return (f"{self.active}/{self.max_total} transfers, "
+                f"{self.bytes_in_flight / MB:.0f}/{self.max_bytes_in_flight / MB:.0f} MB in flight, "
+                f"{len(self._waiting)} waiting")
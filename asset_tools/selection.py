@@ -0,0 +1,154 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from asset_tools.ambientcg import parse_size_label
+
+# --- 1. LABEL PARSING ---
+
+FORMATS = ("PNG", "JPG", "EXR", "HDR", "TIF", "SBSAR", "BLEND", "USDZ", "USDC", "USD", "FBX", "OBJ", "GLB")
+DEFAULT_RULES = ["highest PNG <=4K"]
+
+_RESOLUTION_RE = re.compile(r"\b(\d+)K\b", re.IGNORECASE)
+
+
+def parse_label(label):
+    """'8K-PNG .zip 652 MB' -> {"resolution": 8, "format": "PNG", "size": 683671552}.
+
+    Resolution is in K (None for resolution-less files such as .blend scenes); size is None when the
+    label carries none.
+    """
+    tokens = re.split(r"[\s\-_.]+", (label or "").upper())
+    match = _RESOLUTION_RE.search(label or "")
+    return {
+        "resolution": int(match.group(1)) if match else None,
+        "format": next((t for t in tokens if t in FORMATS), None),
+        "size": parse_size_label(label),
+    }
+
+
+# --- 2. RULES ---
+
+_CONSTRAINT_RE = re.compile(r"^(<=|>=|=|<|>)(\d+)K$", re.IGNORECASE)
+_COMPARE = {
+    "<=": lambda a, b: a <= b, ">=": lambda a, b: a >= b, "=": lambda a, b: a == b,
+    "<": lambda a, b: a < b, ">": lambda a, b: a > b,
+}
+
+
+class Rule:
+    """One selection rule: `<highest|lowest|all> <FORMATS|*> [constraints...]`.
+
+    FORMATS is a comma list such as `PNG,EXR`. Constraints are resolution bounds (`<=4K`, `>=2K`,
+    `=8K`), `contains:<text>` and `not:<text>` (case-insensitive label substrings).
+    `highest`/`lowest` keep one file per format: the largest/smallest resolution that passes.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        words = text.split()
+        if len(words) < 2 or words[0].lower() not in ("highest", "lowest", "all"):
+            raise ValueError(f"Rule must start with highest/lowest/all and a format: {text!r}")
+        self.pick = words[0].lower()
+        self.formats = None if words[1] == "*" else {f.upper() for f in words[1].split(",")}
+        self.bounds, self.contains, self.excludes = [], [], []
+        for word in words[2:]:
+            bound = _CONSTRAINT_RE.match(word)
+            if bound:
+                self.bounds.append((_COMPARE[bound.group(1)], int(bound.group(2))))
+            elif word.lower().startswith("contains:"):
+                self.contains.append(word[len("contains:"):].upper())
+            elif word.lower().startswith("not:"):
+                self.excludes.append(word[len("not:"):].upper())
+            else:
+                raise ValueError(f"Unknown constraint {word!r} in rule {text!r}")
+
+    def matches(self, label, info):
+        upper = label.upper()
+        if self.formats is not None and info["format"] not in self.formats:
+            return False
+        if any(text not in upper for text in self.contains) or any(text in upper for text in self.excludes):
+            return False
+        if self.bounds and info["resolution"] is None:
+            return False
+        return all(compare(info["resolution"], limit) for compare, limit in self.bounds)
+
+    def select(self, parsed):
+        """Indexes into `parsed` [(label, info), ...] chosen by this rule."""
+        hits = [i for i, (label, info) in enumerate(parsed) if self.matches(label, info)]
+        if self.pick == "all":
+            return hits
+        best = {}
+        for i in hits:
+            info = parsed[i][1]
+            current = best.get(info["format"])
+            resolution = info["resolution"] or 0
+            if current is None:
+                best[info["format"]] = i
+                continue
+            other = parsed[current][1]["resolution"] or 0
+            if (resolution > other) if self.pick == "highest" else (resolution < other):
+                best[info["format"]] = i
+        return sorted(best.values())
+
+
+def compile_rules(texts):
+    return [Rule(text) for text in texts]
+
+
+def select_links(links, rules):
+    """Filters [(label, link), ...] down to the union of every rule's picks, keeping page order."""
+    parsed = [(label, parse_label(label)) for label, _ in links]
+    chosen = set()
+    for rule in rules:
+        chosen.update(rule.select(parsed))
+    return [links[i] for i in sorted(chosen)]
+
+
+# --- 3. DRY-RUN PLANNER ---
+
+def plan_assets(fetch_links, asset_ids, rules, workers=4, limiter=None, on_asset=None, should_stop=None):
+    """Fetches every asset's download list and totals what `rules` would download, without downloading.
+
+    `fetch_links(asset_id)` returns [(label, url), ...]. Every fetch runs inside `limiter.request()`.
+    `on_asset(asset_id, chosen, links)` is called as each asset is planned. Once `should_stop()`
+    returns True the remaining assets are left out of the report.
+    """
+    should_stop = should_stop or (lambda: False)
+    report = {"assets": 0, "planned_assets": 0, "files": 0, "bytes": 0, "unknown_size": 0,
+              "offered_files": 0, "offered_bytes": 0, "failed": [], "by_format": {}}
+
+    def job(asset_id):
+        if should_stop():
+            return None
+        with limiter.request() if limiter is not None else nullcontext():
+            return fetch_links(asset_id)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(job, asset_id): asset_id for asset_id in asset_ids}
+        for future in as_completed(futures):
+            asset_id = futures[future]
+            try:
+                links = future.result()
+            except Exception as e:
+                report["assets"] += 1
+                report["failed"].append((asset_id, str(e)))
+                continue
+            if links is None:
+                continue
+            report["assets"] += 1
+            chosen = select_links(links, rules)
+            report["offered_files"] += len(links)
+            report["offered_bytes"] += sum(parse_size_label(label) or 0 for label, _ in links)
+            if chosen:
+                report["planned_assets"] += 1
+            for label, _ in chosen:
+                info = parse_label(label)
+                files, size = report["by_format"].get(info["format"] or "OTHER", (0, 0))
+                report["by_format"][info["format"] or "OTHER"] = (files + 1, size + (info["size"] or 0))
+                report["files"] += 1
+                report["bytes"] += info["size"] or 0
+                report["unknown_size"] += info["size"] is None
+            if on_asset is not None:
+                on_asset(asset_id, chosen, links)
+    return report
@@ -0,0 +1,165 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# --- 1. LOCATIONS & DEFAULTS ---
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TELEMETRY_DIR = os.environ.get("ASSET_TELEMETRY_DIR") or os.path.join(REPO_ROOT, "telemetry")
+# Point this at node_exporter's --collector.textfile.directory to have the metrics scraped.
+TEXTFILE_DIR = os.environ.get("PROMETHEUS_TEXTFILE_DIR") or TELEMETRY_DIR
+MAX_LOG_BYTES = 32 * 1024 * 1024
+LOG_BACKUPS = 3
+FLUSH_INTERVAL = 5.0  # Seconds between buffered writes of the event log and the metrics file
+
+
+# --- 2. EVENT SINK ---
+
+class EventSink:
+    """Buffered JSONL writer: events are kept in memory and appended in one write per flush.
+
+    Once the file grows past `max_bytes` it is rotated to `.1` ... `.<backups>`, oldest dropped.
+    """
+
+    def __init__(self, path, max_bytes=MAX_LOG_BYTES, backups=LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = []
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def add(self, record):
+        self._buffer.append(json.dumps(record, separators=(",", ":"), default=str))
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data = "\n".join(self._buffer) + "\n"
+        self._buffer = []
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+# --- 3. TELEMETRY ---
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+class Telemetry:
+    """Timing spans, counters and byte totals for one scraper/tool run.
+
+    Every record goes to `<directory>/<name>.events.jsonl` and is folded into in-memory totals that
+    are written as a Prometheus textfile (`asset_tools_<name>.prom` in TEXTFILE_DIR). Both are
+    written at most once per `flush_interval` and on `close()`, so recording costs a dict update.
+    Thread-safe.
+    """
+
+    def __init__(self, name, directory=TELEMETRY_DIR, textfile_dir=TEXTFILE_DIR, flush_interval=FLUSH_INTERVAL):
+        self.name = name
+        self.sink = EventSink(os.path.join(directory, f"{name}.events.jsonl"))
+        self.textfile = os.path.join(textfile_dir, f"asset_tools_{name}.prom")
+        self.flush_interval = flush_interval
+        self._seconds = defaultdict(float)
+        self._counts = defaultdict(int)
+        self._bytes = defaultdict(int)
+        self._events = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._closed = False
+        atexit.register(self.close)
+
+    # --- Recording ---
+
+    def observe(self, phase, seconds, nbytes=None, **fields):
+        """Records one completed `phase` that took `seconds` (and moved `nbytes`, if given)."""
+        record = {"ts": round(time.time(), 3), "phase": phase, "seconds": round(seconds, 4)}
+        if nbytes is not None:
+            record["bytes"] = nbytes
+            if seconds > 0:
+                record["bytes_per_s"] = round(nbytes / seconds)
+        record.update(fields)
+        with self._lock:
+            self._seconds[phase] += seconds
+            self._counts[phase] += 1
+            if nbytes:
+                self._bytes[phase] += nbytes
+            self.sink.add(record)
+            self._maybe_flush()
+
+    def event(self, name, **fields):
+        """Counts a point event (e.g. a skipped or failed asset)."""
+        with self._lock:
+            self._events[name] += 1
+            self.sink.add(dict({"ts": round(time.time(), 3), "event": name}, **fields))
+            self._maybe_flush()
+
+    @contextmanager
+    def span(self, phase, **fields):
+        """Times the block as `phase`. Set `bytes` (or extra fields) on the yielded dict; errors are recorded."""
+        info = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield info
+        except BaseException as e:
+            info["error"] = type(e).__name__
+            raise
+        finally:
+            nbytes = info.pop("bytes", None)
+            self.observe(phase, time.perf_counter() - start, nbytes, **info)
+
+    # --- Output ---
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        self.sink.flush()
+        self._write_textfile()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _write_textfile(self):
+        tool = self.name
+        lines = ["# HELP asset_tools_phase_seconds Time spent per phase.", "# TYPE asset_tools_phase_seconds summary"]
+        for phase in sorted(self._counts):
+            lines.append(f"asset_tools_phase_seconds_sum{_labels(tool=tool, phase=phase)} {self._seconds[phase]:.6f}")
+            lines.append(f"asset_tools_phase_seconds_count{_labels(tool=tool, phase=phase)} {self._counts[phase]}")
+        lines += ["# HELP asset_tools_phase_bytes_total Bytes moved per phase.", "# TYPE asset_tools_phase_bytes_total counter"]
+        for phase in sorted(self._bytes):
+            lines.append(f"asset_tools_phase_bytes_total{_labels(tool=tool, phase=phase)} {self._bytes[phase]}")
+        lines += ["# HELP asset_tools_events_total Point events.", "# TYPE asset_tools_events_total counter"]
+        for name in sorted(self._events):
+            lines.append(f"asset_tools_events_total{_labels(tool=tool, event=name)} {self._events[name]}")
+        lines += ["# HELP asset_tools_last_flush_timestamp_seconds Time of the last metrics write.",
+                  "# TYPE asset_tools_last_flush_timestamp_seconds gauge",
+                  f"asset_tools_last_flush_timestamp_seconds{_labels(tool=tool)} {time.time():.0f}"]
+        os.makedirs(os.path.dirname(self.textfile), exist_ok=True)
+        tmp = self.textfile + ".tmp"  # node_exporter only reads *.prom, so the rename is atomic for it
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.textfile)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_locked()
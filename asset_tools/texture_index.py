@@ -0,0 +1,140 @@
+import json
+import os
+from collections import defaultdict
+
+from asset_tools.dedup import STORE_DIR_NAME, TEXTURE_EXTENSIONS
+from asset_tools.previews import PREVIEW_DIR_NAME
+
+# --- 1. CONFIGURATION ---
+
+CACHE_NAME = ".texture_index.json"
+CACHE_VERSION = 1
+SKIP_DIRS = (STORE_DIR_NAME, PREVIEW_DIR_NAME)  # Blob store and downscaled proxies are not link targets
+
+
+# --- 2. INDEX ---
+
+class TextureIndex:
+    """Texture file name -> paths for every texture under `root`, cached between runs.
+
+    The cache stores each folder's mtime next to the texture names it held. Adding, removing or
+    renaming an entry changes its folder's mtime, so a refresh only stats every known folder and
+    rescans the ones that changed (plus any new subfolders), instead of listing the whole tree.
+    """
+
+    def __init__(self, root, cache_path=None, extensions=TEXTURE_EXTENSIONS):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path or os.path.join(self.root, CACHE_NAME)
+        self.extensions = tuple(e.lower() for e in extensions)
+        self._dirs = {}    # folder -> mtime_ns
+        self._files = {}   # folder -> [texture names]
+        self._by_name = None
+
+    # --- Building ---
+
+    def load(self):
+        """Reads the cache (if any) and brings it up to date; returns (folders rescanned, folders total)."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and data.get("root") == self.root:
+                self._dirs = data["dirs"]
+                self._files = data["files"]
+        except (OSError, ValueError, KeyError):
+            self._dirs, self._files = {}, {}
+        rescanned = self.refresh()
+        return rescanned, len(self._dirs)
+
+    def refresh(self):
+        if not self._dirs:
+            return self._scan_tree(self.root)
+        rescanned = 0
+        for folder, mtime in list(self._dirs.items()):
+            try:
+                current = os.stat(folder).st_mtime_ns
+            except OSError:
+                self._drop(folder)
+                continue
+            if current != mtime:
+                rescanned += self._scan_folder(folder, recurse_new=True)
+        return rescanned
+
+    def _drop(self, folder):
+        self._dirs.pop(folder, None)
+        self._files.pop(folder, None)
+        self._by_name = None
+
+    def _scan_folder(self, folder, recurse_new=False):
+        """Re-lists one folder; with `recurse_new`, folders not seen before are scanned in full."""
+        try:
+            entries = list(os.scandir(folder))
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            self._drop(folder)
+            return 0
+        scanned = 1
+        names = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS and recurse_new and entry.path not in self._dirs:
+                    scanned += self._scan_tree(entry.path)
+            elif entry.name.lower().endswith(self.extensions):
+                names.append(entry.name)
+        self._dirs[folder] = mtime
+        self._files[folder] = names
+        self._by_name = None
+        return scanned
+
+    def _scan_tree(self, top):
+        scanned = 0
+        stack = [top]
+        while stack:
+            folder = stack.pop()
+            scanned += self._scan_folder(folder)
+            try:
+                stack.extend(e.path for e in os.scandir(folder)
+                             if e.is_dir(follow_symlinks=False) and e.name not in SKIP_DIRS)
+            except OSError:
+                pass
+        return scanned
+
+    def save(self):
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "root": self.root, "dirs": self._dirs, "files": self._files}, f)
+        os.replace(tmp, self.cache_path)
+
+    # --- Lookup ---
+
+    def __len__(self):
+        return sum(len(names) for names in self._files.values())
+
+    def _names(self):
+        if self._by_name is None:
+            by_name = defaultdict(list)
+            for folder, names in self._files.items():
+                for name in names:
+                    by_name[name.lower()].append(os.path.join(folder, name))
+            self._by_name = by_name
+        return self._by_name
+
+    def lookup(self, filename, near=None):
+        """Path of the texture called `filename` (any folder, case-insensitive), or None.
+
+        When several folders hold the same name, the one sharing the longest path with `near`
+        (usually the folder of the .c4d file being imported) wins.
+        """
+        candidates = self._names().get(os.path.basename(filename.replace("\\", "/")).lower())
+        if not candidates:
+            return None
+        if len(candidates) == 1 or near is None:
+            return candidates[0]
+        near = os.path.abspath(near)
+        return max(candidates, key=lambda path: _shared_length(path, near))
+
+
+def _shared_length(a, b):
+    try:
+        return len(os.path.commonpath([a, b]))
+    except ValueError:  # Different drives
+        return -1
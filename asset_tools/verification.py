@@ -0,0 +1,70 @@
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# --- 1. CRC CHECK ---
+
+def verify_archive(zip_path):
+    """Worker entry point: reads every member of `zip_path` and checks it against its stored CRC.
+
+    Returns a dict with path, size, mtime_ns (the cache key), ok, error, bytes and seconds.
+    """
+    st = os.stat(zip_path)
+    result = {"path": zip_path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "ok": False, "error": None,
+              "bytes": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            bad = archive.testzip()
+            result["bytes"] = sum(i.file_size for i in archive.infolist())
+        if bad is not None:
+            result["error"] = f"CRC mismatch in {bad}"
+        else:
+            result["ok"] = True
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError, EOFError, ValueError) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+# --- 2. CACHED PLAN ---
+
+def plan_verification(zip_paths, cache):
+    """Splits archives into (todo, cached) using `cache` {abs path: {size, mtime_ns, ok, error}}.
+
+    An archive is only re-checked when its size or mtime changed since its last verification.
+    `cached` holds the stored results for the rest, so known-corrupt archives are still reported.
+    """
+    todo, cached = [], []
+    for path in zip_paths:
+        entry = cache.get(os.path.abspath(path))
+        st = os.stat(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            cached.append(dict(entry, path=path))
+        else:
+            todo.append(path)
+    return todo, cached
+
+
+def verify_all(zip_paths, workers=None, on_result=None):
+    """CRC-checks archives across a process pool, largest first so the long ones do not finish last."""
+    zip_paths = sorted(zip_paths, key=os.path.getsize, reverse=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(verify_archive, path) for path in zip_paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+# --- 3. FEEDBACK ---
+
+def quarantine(path):
+    """Renames a corrupt archive to `<name>.corrupt` so duplicate checks and extractors no longer see it."""
+    target = path + ".corrupt"
+    os.replace(path, target)
+    return target
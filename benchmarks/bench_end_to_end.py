@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: CPU comes from os.times(), peak RSS is not reported
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+for path in (REPO_ROOT, BENCH_DIR, os.path.join(REPO_ROOT, "C4D-API-Scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from asset_tools import ambientcg, c4dcenter
+from asset_tools.extraction import extract_all
+from asset_tools.http_client import download_resumable, make_session
+from asset_tools.scheduler import DownloadScheduler
+from asset_tools.selection import DEFAULT_RULES, compile_rules, select_links
+from import_planner import plan_import, scan_library
+from mock_sites import PRODUCTS_PER_PAGE, start_server
+
+# --- 1. MEASUREMENT ---
+
+def _cpu_seconds():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _maxrss_mb(who):
+    if resource is None:
+        return None
+    scale = 1048576 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def _reset_peak_rss():
+    """Resets this process's RSS high-water mark (Linux 4.0+); False where that is not possible."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(stage_scoped):
+    """(MB, scope): the peak since `_reset_peak_rss()` ("stage"), else the process-lifetime peak ("process")."""
+    if stage_scoped:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024, "stage"
+    return _maxrss_mb(resource.RUSAGE_SELF) if resource else None, "process"
+
+
+def measure(name, fn):
+    """Runs fn() -> (items, bytes) and returns one result row."""
+    stage_scoped = _reset_peak_rss()
+    cpu = _cpu_seconds()
+    start = time.perf_counter()
+    items, nbytes = fn()
+    elapsed = time.perf_counter() - start
+    rss, scope = _peak_rss_mb(stage_scoped)
+    return {"stage": name, "items": items, "bytes": nbytes, "seconds": round(elapsed, 3),
+            "items_per_min": round(items / elapsed * 60, 1) if elapsed else None,
+            "mb_per_s": round(nbytes / 1048576 / elapsed, 2) if elapsed else None,
+            "cpu_seconds": round(_cpu_seconds() - cpu, 3), "peak_rss_mb": rss, "rss_scope": scope,
+            "worker_peak_rss_mb": _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else None}
+
+
+# --- 2. STAGES ---
+
+def c4d_crawl(base_url, assets, workers):
+    session = make_session(pool_size=workers)
+    pages = range(1, (assets + PRODUCTS_PER_PAGE - 1) // PRODUCTS_PER_PAGE + 1)
+    products, failed = c4dcenter.crawl_listing_pages(c4dcenter.http_fetcher(session), pages, base_url=base_url,
+                                                     max_workers=workers)
+    if failed:
+        raise RuntimeError(f"Listing pages failed: {failed}")
+    return products
+
+
+def c4d_download(base_url, products, dest, workers):
+    session = make_session(pool_size=workers)
+    urls = [url if url.startswith("http") else base_url + url for url in products]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda url: c4dcenter.download_product(session, url, dest), urls))
+    return len(results), sum(size for _, size in results)
+
+
+def acg_crawl(base_url):
+    session = make_session(pool_size=1)
+    ids = []
+    for fresh, _ in ambientcg.iter_new_assets(session, set(), {"backfill_offset": 0, "complete": False},
+                                              base_url=base_url, page_delay=0):
+        ids.extend(fresh)
+    return ids
+
+
+def acg_download(base_url, ids, dest, workers):
+    """Mirrors the AmbientCG HTTP engine: view page -> selection rules -> scheduled resumable transfers."""
+    session = make_session(pool_size=workers + 1)
+    rules = compile_rules(DEFAULT_RULES)
+    executor = ThreadPoolExecutor(max_workers=workers + 1)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        scheduler = DownloadScheduler(max_per_host=workers, max_total=workers, executor=executor)
+
+        async def one(asset_id):
+            links = await loop.run_in_executor(executor, ambientcg.fetch_download_links, session, asset_id, base_url)
+            jobs = [scheduler.run(url, ambientcg.parse_size_label(label), download_resumable, session, url, dest)
+                    for label, url in select_links(links, rules)]
+            return await asyncio.gather(*jobs)
+
+        return await asyncio.gather(*(one(asset_id) for asset_id in ids))
+
+    try:
+        results = [r for asset in asyncio.run(run()) for r in asset]
+    finally:
+        executor.shutdown()
+    return len(ids), sum(size for _, size in results)
+
+
+def extract(download_dirs, dest, workers):
+    zips = [os.path.join(d, n) for d in download_dirs for n in os.listdir(d) if n.endswith(".zip")]
+    results = extract_all(zips, dest, workers=workers)
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        raise RuntimeError(f"{len(failed)} extraction(s) failed, e.g. {failed[0]['error']}")
+    return len(results), sum(r["bytes"] for r in results)
+
+
+def import_planning(extracted_dir):
+    """The importer's planning step: scan the extracted library and diff it against an empty manifest."""
+    plan = plan_import(scan_library(extracted_dir), {})
+    return len(plan.new), sum(f.size for f in plan.new)
+
+
+# --- 3. REPORT & REGRESSION CHECK ---
+
+def _mb(value, mark=""):
+    return f"{value:.0f}{mark}" if value is not None else "n/a"
+
+
+def print_report(rows):
+    print(f"{'Stage':<16}{'Items':>7}{'Seconds':>10}{'Items/min':>11}{'MB/s':>9}{'CPU s':>8}{'Peak RSS MB':>13}"
+          f"{'Workers MB*':>13}")
+    for r in rows:
+        rss = _mb(r["peak_rss_mb"], "*" if r["rss_scope"] == "process" else "")
+        print(f"{r['stage']:<16}{r['items']:>7}{r['seconds']:>10.2f}{r['items_per_min'] or 0:>11.0f}"
+              f"{r['mb_per_s'] or 0:>9.1f}{r['cpu_seconds']:>8.2f}{rss:>13}{_mb(r['worker_peak_rss_mb']):>13}")
+    print("Peak RSS is this process's peak during the stage. Values marked * are cumulative process-lifetime "
+          "peaks (the largest of any worker process so far, or of this process where its peak cannot be reset).")
+
+
+def compare(rows, baseline_path, tolerance):
+    """Returns the stages whose items/min dropped more than `tolerance` below the baseline run."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["stage"]: r for r in json.load(f)["stages"]}
+    regressions = []
+    for r in rows:
+        old = baseline.get(r["stage"])
+        if not old or not old.get("items_per_min") or r["items_per_min"] is None:
+            continue
+        change = r["items_per_min"] / old["items_per_min"] - 1
+        print(f"  {r['stage']:<16}{change:+.1%} items/min vs baseline")
+        if change < -tolerance:
+            regressions.append(r["stage"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark against a local mock of both sites.")
+    parser.add_argument("--assets", type=int, default=48, help="Products/assets served by each mock site")
+    parser.add_argument("--zip-mb", type=float, default=4.0, help="Size of each downloaded archive")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server seconds per request")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests / extraction processes")
+    parser.add_argument("--json", help="Write results to this file (use as a later --baseline)")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed items/min drop before failing")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary work folder")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.assets, int(args.zip_mb * 1048576), args.latency)
+    work = tempfile.mkdtemp(prefix="asset_bench_")
+    c4d_dir, acg_dir, extracted = (os.path.join(work, n) for n in ("c4dcenter", "ambientcg", "Extracted_Materials"))
+    for path in (c4d_dir, acg_dir, extracted):
+        os.makedirs(path)
+
+    state = {}
+    stages = [
+        ("c4d_crawl", lambda: (len(state.setdefault("products", c4d_crawl(base_url, args.assets, args.workers))), 0)),
+        ("c4d_download", lambda: c4d_download(base_url, state["products"], c4d_dir, args.workers)),
+        ("acg_crawl", lambda: (len(state.setdefault("ids", acg_crawl(base_url))), 0)),
+        ("acg_download", lambda: acg_download(base_url, state["ids"], acg_dir, args.workers)),
+        ("extract", lambda: extract([c4d_dir, acg_dir], extracted, args.workers)),
+        ("import_planning", lambda: import_planning(extracted)),
+    ]
+    print(f"--- End-to-End Benchmark ({args.assets} assets/site, {args.zip_mb:g} MB archives, "
+          f"{args.latency * 1000:.0f} ms latency, {args.workers} workers) ---")
+    try:
+        rows = [measure(name, fn) for name, fn in stages]
+    finally:
+        server.terminate()
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "stages": rows}, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+    if args.baseline:
+        print(f"\nCompared with {args.baseline}:")
+        regressions = compare(rows, args.baseline, args.tolerance)
+        if regressions:
+            print(f"REGRESSION in: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+IMPORTER = os.path.join(REPO_ROOT, "C4D-API-Scripts", "c4d-importer.py")
+
+# --- 1. FIXTURES ---
+
+def write_scene(path, name, version=0):
+    """One material whose bitmaps use a path relative to the scene and a stale absolute path from another machine."""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    for texture in (f"{name}_Color.png", f"{name}_NormalGL.png"):
+        open(os.path.join(folder, texture), "wb").close()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"mat:{name}|{name}_Color.png|C:\\Users\\someone\\Downloads\\{name}\\{name}_NormalGL.png\n"
+                f"# revision {version}\n")
+
+
+def build_library(root, files):
+    for n in range(files):
+        name = f"Material_{n:05d}"
+        write_scene(os.path.join(root, name, f"{name}.c4d"), name)
+
+
+def load_importer(library):
+    """Imports c4d-importer.py against the stub `c4d` module with PARENT_DIRECTORY pointed at `library`."""
+    sys.path.insert(0, os.path.join(BENCH_DIR, "stubs"))
+    spec = importlib.util.spec_from_file_location("c4d_importer", IMPORTER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.PARENT_DIRECTORY = library
+    return module
+
+
+# --- 2. BENCHMARK ---
+
+def timed_run(importer, c4d):
+    before = len(c4d.documents.GetActiveDocument().GetMaterials())
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        importer.import_materials_to_scene()
+    elapsed = time.perf_counter() - start
+    materials = c4d.documents.GetActiveDocument().GetMaterials()
+    return elapsed, len(materials) - before, len(materials)
+
+
+def linked_textures(c4d):
+    """(textures resolving to an existing absolute path, all textures) in the open scene."""
+    paths = [p for mat in c4d.documents.GetActiveDocument().GetMaterials() for p in mat.textures()]
+    return sum(1 for p in paths if os.path.isabs(p) and os.path.isfile(p)), len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time c4d-importer.py runs offline against the stub c4d module.")
+    parser.add_argument("--files", type=int, default=2000, help=".c4d files in the synthetic library")
+    parser.add_argument("--changed", type=int, default=20, help="Files modified before the third run")
+    parser.add_argument("--new", type=int, default=20, help="Files added before the third run")
+    parser.add_argument("--chunk", type=int, default=100, help="Files per import chunk (CHUNK_FILES)")
+    parser.add_argument("--library", action="store_true", help="Write chunk library files instead of the scene")
+    parser.add_argument("--no-relink", action="store_true", help="Turn off texture relinking (RELINK_TEXTURES)")
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix="import_bench_")
+    library = os.path.join(work, "Extracted_Materials")
+    os.environ["ASSET_CATALOG"] = os.path.join(work, "catalog.sqlite3")  # Keep the real catalog untouched...
+    os.environ["ASSET_TELEMETRY_DIR"] = os.path.join(work, "telemetry")  # ...and the repo's telemetry/ folder
+    os.environ["PROMETHEUS_TEXTFILE_DIR"] = os.environ["ASSET_TELEMETRY_DIR"]
+    try:
+        build_library(library, args.files)
+        importer = load_importer(library)
+        importer.CHUNK_FILES = args.chunk
+        importer.LIBRARY_MODE = args.library
+        importer.RELINK_TEXTURES = not args.no_relink
+        importer.LIBRARY_DIR = os.path.join(work, "Material_Libraries")
+        import c4d
+        # The manifest is only kept for saved scenes
+        c4d.documents.GetActiveDocument().SetDocumentPath(work)
+
+        mode = "library files" if args.library else "open scene"
+        print(f"--- Import Benchmark ({args.files} files, chunks of {args.chunk}, into {mode}) ---")
+        seconds, added, total = timed_run(importer, c4d)
+        print(f"  First import:      {seconds:7.3f}s  +{added} materials ({total} in scene)")
+        if not args.library:
+            print("  Textures linked:   {} of {}".format(*linked_textures(c4d)))
+        seconds, added, total = timed_run(importer, c4d)
+        print(f"  Unchanged re-run:  {seconds:7.3f}s  +{added} materials ({total} in scene)")
+
+        time.sleep(0.01)  # Make sure rewritten files get a new mtime on coarse clocks
+        for n in range(args.changed):
+            name = f"Material_{n:05d}"
+            write_scene(os.path.join(library, name, f"{name}.c4d"), name, version=1)
+        for n in range(args.files, args.files + args.new):
+            name = f"Material_{n:05d}"
+            write_scene(os.path.join(library, name, f"{name}.c4d"), name)
+        seconds, added, total = timed_run(importer, c4d)
+        print(f"  After {args.changed} changed + {args.new} new: {seconds:7.3f}s  +{added} materials ({total} in scene)")
+        if args.library:
+            print(f"  Library files written: {len(os.listdir(importer.LIBRARY_DIR))}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
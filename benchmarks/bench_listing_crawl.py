@@ -0,0 +1,78 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from asset_tools import c4dcenter
+
+# --- 1. FIXTURES ---
+
+def synthetic_page(page_num, products_per_page=24):
+    """Builds a material-library page shaped like the live WooCommerce markup."""
+    items = []
+    for i in range(products_per_page):
+        slug = f"material-{page_num:03d}-{i:02d}"
+        items.append(
+            f'<li class="product type-product status-publish has-post-title">'
+            f'<a href="https://c4dcenter.com/product/{slug}/" class="woocommerce-LoopProduct-link woocommerce-loop-product__link">'
+            f'<img src="https://c4dcenter.com/wp-content/uploads/{slug}-300x300.jpg" alt="{slug}">'
+            f'<h2 class="woocommerce-loop-product__title">{slug}</h2></a>'
+            f'<a href="?add-to-cart={page_num * 100 + i}" class="button">Download</a></li>')
+    nav = "".join(f'<a class="page-numbers" href="/material-library/page/{n}/">{n}</a>' for n in range(1, 150))
+    return (f"<html><head><title>Material Library</title></head><body><div class='site'>"
+            f"<ul class=\"products columns-4\">{''.join(items)}</ul><nav>{nav}</nav></div></body></html>")
+
+
+def fixture_fetcher(fixture_dir):
+    """`fetch(url)` that serves saved pages named page-<N>.html from `fixture_dir`."""
+    def fetch(url):
+        match = re.search(r"/page/(\d+)/", url)
+        page_num = int(match.group(1)) if match else 1
+        with open(os.path.join(fixture_dir, f"page-{page_num}.html"), "r", encoding="utf-8") as f:
+            return f.read()
+    return fetch
+
+
+# --- 2. BENCHMARK ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the C4DCenter listing crawl against saved HTML.")
+    parser.add_argument("--fixtures", help="Folder with page-<N>.html files (synthetic pages when omitted)")
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per request")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fetch = fixture_fetcher(args.fixtures)
+        pages = sorted(int(m.group(1)) for m in (re.match(r"page-(\d+)\.html$", n) for n in os.listdir(args.fixtures)) if m)
+    else:
+        cache = {n: synthetic_page(n) for n in range(1, args.pages + 1)}
+        fetch = lambda url: cache[int(re.search(r"/page/(\d+)/", url).group(1)) if "/page/" in url else 1]
+        pages = list(cache)
+
+    if args.latency:
+        raw_fetch = fetch
+        def fetch(url):
+            time.sleep(args.latency)
+            return raw_fetch(url)
+
+    start = time.perf_counter()
+    products, failed = c4dcenter.crawl_listing_pages(fetch, pages, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print("--- Listing Crawl Benchmark ---")
+    print(f"  Pages:          {len(pages)} ({len(failed)} failed)")
+    print(f"  Products:       {len(products)}")
+    print(f"  Workers:        {args.workers}")
+    print(f"  Elapsed:        {elapsed:.3f}s")
+    print(f"  Pages/second:   {len(pages) / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
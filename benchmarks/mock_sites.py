@@ -0,0 +1,167 @@
+import functools
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# --- 1. SYNTHETIC CONTENT ---
+# One local server stands in for both sites; their paths do not overlap:
+#   C4D Center: /material-library/[page/N/], /product/<slug>/, POST /somdn-download/<slug>/
+#   AmbientCG:  /api/v2/full_json, /view?id=<id>, /get?file=<id>_<res>-<fmt>.zip
+
+PRODUCTS_PER_PAGE = 24
+RESOLUTION_SCALE = {"1K": 1 / 16, "2K": 1 / 4, "4K": 1, "8K": 4}  # Archive size relative to --zip-mb
+_NOISE = os.urandom(1024 * 1024)  # Incompressible payload, tiled to the requested size
+
+
+def c4d_slug(n):
+    return f"mock-material-{n:04d}"
+
+
+def acg_id(n):
+    return f"MockAsset{n:04d}"
+
+
+def _payload(size):
+    return (_NOISE * (size // len(_NOISE) + 1))[:size]
+
+
+@functools.lru_cache(maxsize=16)
+def synthetic_zip(name, size):
+    """A stored (uncompressed) zip of roughly `size` bytes laid out like a downloaded material."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        color = max(size * 2 // 3, 1)
+        archive.writestr(f"{name}/{name}_Color.png", _payload(color))
+        archive.writestr(f"{name}/{name}_NormalGL.png", _payload(max(size - color, 1)))
+        archive.writestr(f"{name}/{name}.c4d", b"C4D mock scene " + name.encode())
+    return buffer.getvalue()
+
+
+# --- 2. REQUEST HANDLER ---
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = {"assets": 48, "zip_bytes": 4 * 1024 * 1024, "latency": 0.0}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, content_type="text/html; charset=utf-8", status=200, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_file(self, name, data):
+        disposition = {"Content-Disposition": f'attachment; filename="{name}"', "Accept-Ranges": "bytes"}
+        match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            disposition["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return self._send(data[start:end + 1], "application/zip", 206, disposition)
+        self._send(data, "application/zip", headers=disposition)
+
+    def do_GET(self):
+        time.sleep(self.config["latency"])
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        page = re.match(r"^/material-library/(?:page/(\d+)/)?$", url.path)
+        if page:
+            return self._send(self.listing_page(int(page.group(1) or 1)).encode())
+        product = re.match(r"^/product/([\w-]+)/$", url.path)
+        if product:
+            return self._send(self.product_page(product.group(1)).encode())
+        if url.path == "/api/v2/full_json":
+            return self._send(self.api_page(int(query.get("offset", 0)), int(query.get("limit", 100))),
+                              "application/json")
+        if url.path == "/view" and "id" in query:
+            return self._send(self.view_page(query["id"]).encode())
+        if url.path == "/get" and "file" in query:
+            stem = os.path.splitext(query["file"])[0]
+            resolution = stem.rsplit("_", 1)[-1].split("-")[0]
+            size = int(self.config["zip_bytes"] * RESOLUTION_SCALE.get(resolution, 1))
+            return self._send_file(query["file"], synthetic_zip(stem, size))
+        self._send(b"<html>Not found</html>", status=404)
+
+    def do_POST(self):
+        time.sleep(self.config["latency"])
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        match = re.match(r"^/somdn-download/([\w-]+)/$", urlparse(self.path).path)
+        if not match:
+            return self._send(b"<html>Not found</html>", status=404)
+        name = match.group(1).replace("-", "_").title()
+        self._send_file(f"{name}.zip", synthetic_zip(name, self.config["zip_bytes"]))
+
+    # --- C4D Center pages ---
+
+    def listing_page(self, page_num):
+        first = (page_num - 1) * PRODUCTS_PER_PAGE
+        items = "".join(
+            f'<li class="product type-product"><a href="/product/{c4d_slug(n)}/" '
+            f'class="woocommerce-LoopProduct-link woocommerce-loop-product__link"><h2>{c4d_slug(n)}</h2></a></li>'
+            for n in range(first, min(first + PRODUCTS_PER_PAGE, self.config["assets"])))
+        return f'<html><body><ul class="products columns-4">{items}</ul></body></html>'
+
+    def product_page(self, slug):
+        return (f'<html><body><h1>{slug}</h1>'
+                f'<form class="somdn-download-form" action="/somdn-download/{slug}/" method="post">'
+                f'<input type="hidden" name="somdn_download_key" value="k-{slug}">'
+                f'<input type="hidden" name="somdn_product" value="{slug}">'
+                f'<button type="submit" id="somdn-form-submit-button">Download</button></form></body></html>')
+
+    # --- AmbientCG pages ---
+
+    def api_page(self, offset, limit):
+        ids = [acg_id(n) for n in range(offset, min(offset + limit, self.config["assets"]))]
+        return json.dumps({"foundAssets": [{"assetId": i} for i in ids],
+                           "numberOfResults": self.config["assets"]}).encode()
+
+    def view_page(self, asset_id):
+        links = []
+        for resolution, scale in RESOLUTION_SCALE.items():
+            for fmt in ("JPG", "PNG"):
+                mb = self.config["zip_bytes"] * scale / 1048576
+                links.append(f'<a href="/get?file={asset_id}_{resolution}-{fmt}.zip">'
+                             f'{resolution}-{fmt}<br>.zip {mb:.1f} MB</a>')
+        return f'<html><body><h1>{asset_id}</h1><div class="downloads">{"".join(links)}</div></body></html>'
+
+
+# --- 3. SERVER PROCESS ---
+
+def _serve(config, ready):
+    MockHandler.config = config
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(assets=48, zip_bytes=4 * 1024 * 1024, latency=0.0):
+    """Starts the mock server in its own process (so it does not skew CPU/RSS numbers); returns (process, base_url)."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=({"assets": assets, "zip_bytes": zip_bytes,
+                                                             "latency": latency}, ready), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{ready.get(timeout=30)}"
+
+
+if __name__ == "__main__":
+    process, base_url = start_server(assets=int(sys.argv[1]) if len(sys.argv) > 1 else 48)
+    print(f"Mock C4D Center + AmbientCG serving at {base_url} (Ctrl+C to stop)")
+    print(f'Set "base_url" in either scraper config to this address to run a scraper against it.')
+    try:
+        process.join()
+    except KeyboardInterrupt:
+        process.terminate()
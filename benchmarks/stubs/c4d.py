@@ -0,0 +1,173 @@
+"""Minimal stand-in for Cinema 4D's `c4d` module, covering what C4D-API-Scripts/c4d-importer.py calls.
+
+Put `benchmarks/stubs` on sys.path to run the importer outside Cinema 4D. A "scene" is any file:
+LoadDocument() gives it one material per line starting with "mat:", or one named after the file.
+A line "mat:Name|a.png|maps/b.jpg" also gives the material one bitmap shader per texture path.
+"""
+import os
+from types import SimpleNamespace
+
+SCENEFILTER_OBJECTS = 1
+SCENEFILTER_MATERIALS = 2
+SCENEFILTER_MERGESCENE = 16
+COPYFLAGS_NONE = 0
+SAVEDOCUMENTFLAGS_DONTADDTORECENTLIST = 2
+FORMAT_C4DEXPORT = 1036
+MSG_UPDATE = 14
+Xbitmap = 5833
+BITMAPSHADER_FILENAME = 1000
+
+events = 0
+
+
+class BaseList2D:
+    def __init__(self, name=""):
+        self._name = name
+        self._unique_ids = {}
+
+    def AddUniqueID(self, appid, mem):
+        self._unique_ids[appid] = bytes(mem)
+        return True
+
+    def FindUniqueID(self, appid):
+        mem = self._unique_ids.get(appid)
+        return memoryview(mem) if mem is not None else None
+
+    def GetName(self):
+        return self._name
+
+    def SetName(self, name):
+        self._name = name
+
+
+class BaseShader(BaseList2D):
+    def __init__(self, shader_type=Xbitmap, filename=""):
+        super().__init__("Bitmap")
+        self._type = shader_type
+        self._data = {BITMAPSHADER_FILENAME: filename}
+        self._next = None
+
+    def __getitem__(self, key):
+        return self._data.get(key)
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def CheckType(self, shader_type):
+        return self._type == shader_type
+
+    def GetDown(self):
+        return None
+
+    def GetNext(self):
+        return self._next
+
+
+class BaseMaterial(BaseList2D):
+    def __init__(self, name, textures=()):
+        super().__init__(name)
+        self._parent = None
+        self._shaders = [BaseShader(filename=t) for t in textures]
+        for shader, following in zip(self._shaders, self._shaders[1:]):
+            shader._next = following
+        self.updates = 0
+
+    def textures(self):
+        return [s[BITMAPSHADER_FILENAME] for s in self._shaders]
+
+    def GetFirstShader(self):
+        return self._shaders[0] if self._shaders else None
+
+    def Message(self, msg, data=None):
+        if msg == MSG_UPDATE:
+            self.updates += 1
+        return True
+
+    def GetClone(self, flags=COPYFLAGS_NONE):
+        return BaseMaterial(self._name, self.textures())
+
+    def Remove(self):
+        if self._parent is not None:
+            self._parent._materials.remove(self)
+            self._parent = None
+
+
+class BaseDocument(BaseList2D):
+    def __init__(self, name="Untitled 1", path=""):
+        super().__init__(name)
+        self._path = path
+        self._materials = []
+
+    def GetDocumentName(self):
+        return self._name
+
+    def GetDocumentPath(self):
+        return self._path
+
+    def SetDocumentPath(self, path):
+        self._path = path
+
+    def GetMaterials(self):
+        return list(self._materials)
+
+    def InsertMaterial(self, mat):
+        mat._parent = self
+        self._materials.insert(0, mat)
+
+    def SearchMaterial(self, name):
+        return next((m for m in self._materials if m.GetName() == name), None)
+
+
+def _load_document(path, flags, thread=None):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            specs = [line[4:].strip().split("|") for line in f if line.startswith("mat:")]
+    except OSError:
+        return None
+    doc = BaseDocument(os.path.basename(path), os.path.dirname(path))
+    for name, *textures in specs or [[os.path.splitext(os.path.basename(path))[0]]]:
+        doc.InsertMaterial(BaseMaterial(name, textures))
+    return doc
+
+
+def _save_document(doc, path, flags, fmt):
+    with open(path, "w", encoding="utf-8") as f:
+        for mat in reversed(doc.GetMaterials()):
+            f.write("mat:" + "|".join([mat.GetName()] + mat.textures()) + "\n")
+    return True
+
+
+_active = BaseDocument()
+
+documents = SimpleNamespace(
+    GetActiveDocument=lambda: _active,
+    LoadDocument=_load_document,
+    KillDocument=lambda doc: None,
+    BaseDocument=BaseDocument,
+    SaveDocument=_save_document,
+)
+status = {"text": "", "bar": 0}
+
+
+def EventAdd(flags=0):
+    global events
+    events += 1
+
+
+def StatusSetText(text):
+    status["text"] = text
+
+
+def StatusSetBar(percent):
+    status["bar"] = percent
+
+
+def StatusClear():
+    status.update(text="", bar=0)
+
+
+def reset(name="Untitled 1"):
+    """Replaces the active document with an empty one (between benchmark runs)."""
+    global _active
+    _active = BaseDocument(name)
+    return _active
@@ -1,20 +1,81 @@
 import os
-import subprocess
-import shutil
+import time
+
+from asset_tools.catalog import AssetCatalog
+from asset_tools.dedup import deduplicate
+from asset_tools.extraction import describe, extract_all, find_seven_zip, plan_incremental
+from asset_tools.previews import PREVIEW_DIR_NAME, generate_all, plan_previews, require_pillow
+from asset_tools.verification import plan_verification
 
 # --- 1. CONFIGURATION ---
-# Path to your 7-Zip executable. 
-# Check if yours is in 'C:\Program Files (x86)\7-Zip\7z.exe' instead.
-SEVEN_ZIP_PATH = r"C:\Program Files\7-Zip\7z.exe"
+# Archives are extracted with Python's zipfile across one worker process per CPU core.
+# Set EXTRACT_BACKEND = "7z" to hand each archive to 7-Zip instead (found on PATH or in
+# the default Program Files locations, or set SEVEN_ZIP_PATH explicitly).
+EXTRACT_BACKEND = "zipfile"
+SEVEN_ZIP_PATH = None
+WORKERS = os.cpu_count() or 1
+# "hardlink" works everywhere on one volume; "reflink" makes copy-on-write clones (Linux Btrfs/XFS).
+DEDUP_MODE = "hardlink"
+# Previews go to Extracted_Materials/.previews: one thumbnail per material, plus a proxy of every texture
+# no larger than PROXY_SIZE on its long edge (set PROXY_SIZE = None for thumbnails only).
+THUMB_SIZE = 256
+PROXY_SIZE = 1024
+PREVIEW_WORKERS = WORKERS  # Each worker decoding a 16K PNG holds about 1 GB
 
-def run_extractor():
-    print("--- 7-Zip Batch Extractor ---")
-    
-    # Verify 7-Zip exists before asking for paths
-    if not os.path.exists(SEVEN_ZIP_PATH):
-        print(f"CRITICAL ERROR: 7-Zip not found at: {SEVEN_ZIP_PATH}")
-        print("Please locate 7z.exe on your computer and update the SEVEN_ZIP_PATH in this script.")
+def run_dedup(dest_dir):
+    print(f"\n--- Texture Deduplication ({DEDUP_MODE}) ---")
+    try:
+        report = deduplicate(dest_dir, workers=WORKERS, mode=DEDUP_MODE)
+    except ValueError as e:
+        print(f"ERROR: {e}")
         return
+    print(f"Textures scanned:      {report['scanned']}")
+    print(f"Hashed this run:       {report['hashed']}")
+    print(f"Already deduplicated:  {report['already_linked']}")
+    print(f"New unique blobs:      {report['unique_blobs']}")
+    print(f"Copies linked:         {report['linked']}")
+    print(f"Space saved this run:  {report['bytes_saved'] / 1073741824:.2f} GB")
+
+def run_previews(dest_dir, catalog):
+    print(f"\n--- Preview Generation ({THUMB_SIZE}px thumbnails, {PROXY_SIZE or 'no'}px proxies) ---")
+    try:
+        require_pillow()
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        return
+    jobs, up_to_date = plan_previews(dest_dir, catalog.preview_entries(), THUMB_SIZE, PROXY_SIZE)
+    print(f"{len(jobs)} texture(s) to process, {up_to_date} preview(s) already up to date.")
+    if not jobs:
+        return
+    counts = {"written": 0, "failed": 0, "bytes": 0}
+    start = time.perf_counter()
+
+    def report(result):
+        if result["error"]:
+            counts["failed"] += 1
+            print(f"[FAILED] {os.path.relpath(result['source'], dest_dir)}: {result['error']}")
+            return
+        catalog.record_previews(result)
+        counts["written"] += sum(1 for o in result["outputs"] if o["written"])
+        counts["bytes"] += result["size"]
+
+    generate_all(jobs, workers=PREVIEW_WORKERS, on_result=report)
+    elapsed = time.perf_counter() - start
+    print(f"Previews written:      {counts['written']} ({counts['failed']} texture(s) failed)")
+    print(f"Source textures read:  {counts['bytes'] / 1048576:.1f} MB in {elapsed:.1f}s "
+          f"({(len(jobs) - counts['failed']) / max(elapsed, 1e-9):.1f} textures/s)")
+    print(f"Output folder:         {os.path.join(dest_dir, PREVIEW_DIR_NAME)}")
+
+def run_extractor():
+    print("--- Parallel Batch Extractor ---")
+
+    seven_zip = None
+    if EXTRACT_BACKEND == "7z":
+        seven_zip = SEVEN_ZIP_PATH or find_seven_zip()
+        if not seven_zip or not os.path.exists(seven_zip):
+            print(f"CRITICAL ERROR: 7-Zip not found (SEVEN_ZIP_PATH = {SEVEN_ZIP_PATH})")
+            print("Install 7-Zip, update SEVEN_ZIP_PATH, or set EXTRACT_BACKEND = \"zipfile\".")
+            return
 
     # 2. GET PATHS
     source_dir = input("Enter the path where your .zip files are: ").strip().replace('"', '')
@@ -23,6 +84,9 @@ def run_extractor():
         print(f"ERROR: The directory '{source_dir}' does not exist.")
         return
 
+    dedup = input("Deduplicate identical textures after extraction? (y/n): ").lower() in ['y', 'yes']
+    previews = input("Generate preview thumbnails and texture proxies? (y/n): ").lower() in ['y', 'yes']
+
     dest_dir = os.path.join(source_dir, "Extracted_Materials")
     if not os.path.exists(dest_dir):
         os.makedirs(dest_dir)
@@ -36,34 +100,64 @@ def run_extractor():
         print("Make sure the folder contains actual .zip files and not just folders.")
         return
 
-    print(f"Found {len(zip_files)} files. Starting extraction...\n")
-
-    # 4. EXTRACTION LOOP
-    success_count = 0
-    for zip_file in zip_files:
-        zip_path = os.path.join(source_dir, zip_file)
-        
-        # 'x' = extract with paths, '-o' = output dir, '-y' = yes to all
-        cmd = [SEVEN_ZIP_PATH, "x", zip_path, f"-o{dest_dir}", "-y"]
-        
-        print(f"Working on: {zip_file}...", end=" ", flush=True)
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                print("[OK]")
+    # 4. INCREMENTAL PLAN (manifest of previously extracted archives)
+    with AssetCatalog() as catalog:
+        zip_paths = [os.path.join(source_dir, f) for f in zip_files]
+        todo, skipped = plan_incremental(zip_paths, dest_dir, catalog.extraction_entries())
+        # Archives that verify-archives.py found corrupt (and that have not changed since) are left out.
+        _, cached = plan_verification(list(todo), catalog.verification_entries())
+        for entry in cached:
+            if not entry["ok"]:
+                print(f"[CORRUPT] {os.path.basename(entry['path'])} skipped: {entry['error']}")
+                del todo[entry["path"]]
+        repairs = sum(1 for previous in todo.values() if previous is not None)
+
+        print(f"Found {len(zip_files)} files: {len(skipped)} unchanged, {len(todo) - repairs} new, {repairs} to re-check.")
+        if not todo:
+            print("Nothing to extract.")
+            if dedup:
+                run_dedup(dest_dir)
+            if previews:
+                run_previews(dest_dir, catalog)
+            return
+        print(f"Extracting with {WORKERS} worker(s) ({EXTRACT_BACKEND})...\n")
+        for zip_path in todo:
+            catalog.begin_extraction(zip_path, dest_dir)
+
+        # 5. EXTRACTION POOL
+        success_count = 0
+        total_bytes = 0
+        start = time.perf_counter()
+
+        def report(result):
+            nonlocal success_count, total_bytes
+            name = os.path.basename(result["path"])
+            catalog.record_extraction(result)
+            if result["ok"]:
+                print(f"[OK] {name}: {describe(result)}")
+                catalog.set_file_status(result["path"], "extracted")
                 success_count += 1
+                total_bytes += result["bytes"]
             else:
-                print("[FAILED]")
-                print(f"      Reason: {result.stderr}")
-        except Exception as e:
-            print(f"[ERROR] {str(e)}")
+                print(f"[FAILED] {name}")
+                print(f"      Reason: {result['error']}")
+
+        extract_all(list(todo), dest_dir, workers=WORKERS, backend=EXTRACT_BACKEND, seven_zip=seven_zip,
+                    on_result=report, previous=todo)
+        elapsed = time.perf_counter() - start
+
+        print("\n" + "="*30)
+        print(f"Extraction Finished.")
+        print(f"Successfully extracted: {success_count} of {len(todo)} ({len(skipped)} unchanged archives skipped)")
+        print(f"Throughput: {total_bytes / 1048576:.1f} MB in {elapsed:.1f}s ({total_bytes / 1048576 / max(elapsed, 1e-9):.1f} MB/s)")
+        print(f"Destination: {dest_dir}")
+        print("="*30)
 
-    print("\n" + "="*30)
-    print(f"Extraction Finished.")
-    print(f"Successfully extracted: {success_count} of {len(zip_files)}")
-    print(f"Destination: {dest_dir}")
-    print("="*30)
+        if dedup:
+            run_dedup(dest_dir)
+        if previews:
+            run_previews(dest_dir, catalog)
 
 if __name__ == "__main__":
     run_extractor()
-    input("\nPress Enter to close...") # Keeps the window open if you double-click the file
\ No newline at end of file
+    input("\nPress Enter to close...") # Keeps the window open if you double-click the file
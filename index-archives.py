@@ -0,0 +1,69 @@
+import os
+import time
+
+from asset_tools.archive_index import build_index
+from asset_tools.catalog import AssetCatalog
+
+# --- 1. CONFIGURATION ---
+# Only each archive's central directory is read (memory-mapped), one worker process per CPU core.
+# Archives whose size and mtime are unchanged since the last run are not reopened.
+WORKERS = os.cpu_count() or 1
+MAX_RESULTS = 50
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".exr", ".tif", ".tiff")
+
+def run_query(catalog, text):
+    """'16K normal' -> members whose name contains both '16K' and 'normal'; 'images:' limits to image files."""
+    extensions = ()
+    if text.lower().startswith("images:"):
+        extensions = IMAGE_EXTENSIONS
+        text = text[len("images:"):]
+    rows = catalog.find_members(text.split(), extensions=extensions, limit=MAX_RESULTS)
+    for archive_path, name, size, compressed, crc, ratio in rows:
+        print(f"  {size / 1048576:9.1f} MB  {ratio:5.0%}  {os.path.basename(archive_path)} :: {name}")
+    print(f"{len(rows)} match(es){' (limit reached)' if len(rows) == MAX_RESULTS else ''}.")
+
+def run_indexer():
+    print("--- Archive Content Index ---")
+
+    # 2. GET PATHS
+    source_dir = input("Enter the path where your .zip files are: ").strip().replace('"', '')
+
+    if not os.path.exists(source_dir):
+        print(f"ERROR: The directory '{source_dir}' does not exist.")
+        return
+
+    zip_paths = [os.path.join(source_dir, f) for f in os.listdir(source_dir) if f.endswith('.zip')]
+    if not zip_paths:
+        print(f"0 .zip files found in: {source_dir}")
+        return
+
+    # 3. BUILD INDEX
+    catalog = AssetCatalog()
+    start = time.perf_counter()
+
+    def report(entry):
+        if entry["error"]:
+            print(f"[UNREADABLE] {os.path.basename(entry['path'])}: {entry['error']}")
+
+    indexed, unchanged = build_index(catalog, zip_paths, workers=WORKERS, on_entry=report)
+    elapsed = time.perf_counter() - start
+    archives, members, size, compressed, broken = catalog.archive_summary()
+
+    print("\n" + "="*30)
+    print(f"Indexed {indexed} archive(s) in {elapsed:.1f}s ({unchanged} unchanged).")
+    print(f"Index holds {members} files in {archives} archives, {broken} unreadable.")
+    print(f"Uncompressed: {size / 1073741824:.2f} GB, compressed: {compressed / 1073741824:.2f} GB "
+          f"({compressed / max(size, 1):.0%})")
+    print("="*30)
+
+    # 4. QUERY LOOP
+    print("\nSearch member names, e.g. '16K normal' or 'images: roughness'. Leave empty to quit.")
+    while True:
+        text = input("Search: ").strip()
+        if not text:
+            break
+        run_query(catalog, text)
+    catalog.close()
+
+if __name__ == "__main__":
+    run_indexer()
@@ -0,0 +1,100 @@
+import os
+import time
+
+from asset_tools.ambientcg import asset_id_from_archive
+from asset_tools.catalog import AMBIENTCG, AssetCatalog
+from asset_tools.journal_queue import JournalQueue
+from asset_tools.verification import plan_verification, quarantine, verify_all
+
+# --- 1. CONFIGURATION ---
+# Every member of every archive is CRC-checked across one worker process per CPU core. Results are
+# cached in the asset catalog per (path, size, mtime), so unchanged archives are never re-read.
+WORKERS = os.cpu_count() or 1
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Corrupt AmbientCG archives are put back on the scraper's pending queue for the next run.
+AMBIENTCG_QUEUE_FILE = os.path.join(BASE_DIR, "AmbientCG-scraper", "pending_assets.json")
+
+def requeue(catalog, corrupt):
+    """Quarantines corrupt archives and marks their assets failed so the scrapers download them again.
+
+    Archives the catalog has no owner for (downloaded before it existed) are matched to an
+    AmbientCG asset by their file name, e.g. 'Bricks076C_1K-PNG.zip' -> 'Bricks076C'.
+    """
+    requeued = []
+    for path in corrupt:
+        owner = catalog.file_owner(path)
+        catalog.set_file_status(path, "corrupt")
+        moved = quarantine(path)
+        print(f"[QUARANTINED] {os.path.basename(path)} -> {os.path.basename(moved)}")
+        if owner is None:
+            asset_id = asset_id_from_archive(path)
+            if asset_id is None:
+                continue
+            owner = (AMBIENTCG, asset_id)
+        source, asset_id = owner
+        catalog.mark(source, asset_id, "failed")
+        if source == AMBIENTCG:
+            requeued.append(asset_id)
+    if requeued:
+        queue = JournalQueue(AMBIENTCG_QUEUE_FILE)
+        queue.enqueue(requeued)
+        queue.close()
+        print(f"[INFO] Re-queued {len(requeued)} AmbientCG asset(s) in {AMBIENTCG_QUEUE_FILE}")
+    print("[INFO] Other failed assets are downloaded again on the scraper's next pass over their page.")
+
+def run_verifier():
+    print("--- Parallel Archive Verifier ---")
+
+    # 2. GET PATHS
+    source_dir = input("Enter the path where your .zip files are: ").strip().replace('"', '')
+
+    if not os.path.exists(source_dir):
+        print(f"ERROR: The directory '{source_dir}' does not exist.")
+        return
+
+    zip_paths = [os.path.join(source_dir, f) for f in os.listdir(source_dir) if f.endswith('.zip')]
+    if not zip_paths:
+        print(f"0 .zip files found in: {source_dir}")
+        return
+
+    # 3. CACHED PLAN
+    catalog = AssetCatalog()
+    todo, cached = plan_verification(zip_paths, catalog.verification_entries())
+    corrupt = [entry["path"] for entry in cached if not entry["ok"]]
+    print(f"Found {len(zip_paths)} files: {len(cached)} verified before ({len(corrupt)} corrupt), {len(todo)} to check.")
+
+    # 4. VERIFICATION POOL
+    checked_bytes = 0
+    start = time.perf_counter()
+
+    def report(result):
+        nonlocal checked_bytes
+        catalog.record_verification(result)
+        checked_bytes += result["size"]
+        if result["ok"]:
+            print(f"[OK] {os.path.basename(result['path'])} ({result['seconds']:.1f}s)")
+        else:
+            print(f"[CORRUPT] {os.path.basename(result['path'])}")
+            print(f"      Reason: {result['error']}")
+            corrupt.append(result["path"])
+
+    if todo:
+        print(f"Checking with {WORKERS} worker(s)...\n")
+        verify_all(todo, workers=WORKERS, on_result=report)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "="*30)
+    print(f"Verification Finished.")
+    print(f"Checked: {len(todo)} archive(s), {checked_bytes / 1048576:.1f} MB in {elapsed:.1f}s "
+          f"({checked_bytes / 1048576 / max(elapsed, 1e-9):.1f} MB/s)")
+    print(f"Corrupt: {len(corrupt)}")
+    print("="*30)
+
+    # 5. FEEDBACK INTO THE DOWNLOAD QUEUE
+    if corrupt and input("Quarantine corrupt archives and queue them for re-download? (y/n): ").lower() in ['y', 'yes']:
+        requeue(catalog, corrupt)
+    catalog.close()
+
+if __name__ == "__main__":
+    run_verifier()
+    input("\nPress Enter to close...") # Keeps the window open if you double-click the file